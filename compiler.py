@@ -1,21 +1,30 @@
 from abc import ABCMeta, abstractmethod
+from collections import namedtuple
 from typing import Tuple, Union
-import os, re
 
 from emitter import Emitter
 
-_operators: "dict[str, Tuple[int, bool, str]]" = {
-	"+": (0, False, "__ADD_TYPE1_TYPE2", 2),
-	"-": (0, False, "__SUB_TYPE1_TYPE2", 2),
-	"*": (0, False, "__MUL_TYPE1_TYPE2", 2),
-	"/": (0, False, "__DIV_TYPE1_TYPE2", 2),
-	"<<": (0, False, "__LSHIFT_TYPE1_TYPE2", 2),
-	">>": (0, False, "__RSHIFT_TYPE1_TYPE2", 2),
-	"AND": (0, False, "__AND_TYPE1_TYPE2", 2),
-	"OR": (0, False, "__OR_TYPE1_TYPE2", 2),
-	"XOR": (0, False, "__XOR_TYPE1_TYPE2", 2)
+Operator = namedtuple("Operator", "precedence leftAssociative operation arity")
+
+_operators: "dict[str, Operator]" = {
+	"+": Operator(0, False, "ADD", 2),
+	"-": Operator(0, False, "SUB", 2),
+	"*": Operator(0, False, "MUL", 2),
+	"/": Operator(0, False, "DIV", 2),
+	"<<": Operator(0, False, "LSHIFT", 2),
+	">>": Operator(0, False, "RSHIFT", 2),
+	"AND": Operator(0, False, "AND", 2),
+	"OR": Operator(0, False, "OR", 2),
+	"XOR": Operator(0, False, "XOR", 2)
 }
 
+_operationNames: "dict[Tuple[str, ...], str]" = {}
+
+def get_operation_name(operation: str, *typeNames: str) -> str:
+	key = (operation,) + typeNames
+	if key not in _operationNames: _operationNames[key] = "__" + "_".join(key)
+	return _operationNames[key]
+
 class Type(metaclass=ABCMeta):
 	def __init__(self, name: str): self._name = name
 	def GetName(self) -> str: return self._name
@@ -27,18 +36,21 @@ class Type(metaclass=ABCMeta):
 class Resolver:
 	def __init__(self, types: "list[Type]", functions: "list[Callable]"):
 		self._types = types
+		self._typesByName: "dict[str, Type]" = {}
+		for type in types: self._typesByName.setdefault(type.GetName(), type)
 		self._functions: "dict[str, Callable]" = {}
 		for func in functions: self._functions[func.GetName()] = func
+		self._pointerTypes: "dict[int, Tuple[Type, PointerType]]" = {}
 
 	def ResolveSelf(self):
 		for type in self._types: type.Resolve(self)
 
 	def Resolve(self, value: Union[Type, str]) -> Type:
 		if isinstance(value, Type):
-			for otherType in self._types:
-				if otherType.GetName() == value.GetName():
-					return value
+			existing = self._typesByName.get(value.GetName())
+			if existing != None: return existing
 			self._types.append(value)
+			self._typesByName[value.GetName()] = value
 			return value
 		else: return self.GetType(value)
 	
@@ -51,12 +63,19 @@ class Resolver:
 		else: raise Exception("Undefined function \"" + name + "\".")
 
 	def GetType(self, name: str) -> Type:
-		if name.endswith("*"):
-			return PointerType(self.GetType(name[:len(name) - 1]))
-		else:
-			for type in self._types:
-				if type.GetName() == name: return type
-			raise Exception("Undefined type \"" + name + "\".")
+		base = name.rstrip("*")
+		if base not in self._typesByName: raise Exception("Undefined type \"" + base + "\".")
+		type = self._typesByName[base]
+		for _ in range(len(name) - len(base)): type = self.GetPointerType(type)
+		return type
+
+	# Pointer types are shared per referenced type within this resolver, so callers must not mutate them.
+	def GetPointerType(self, referenced: Type) -> "PointerType":
+		entry = self._pointerTypes.get(id(referenced))
+		if entry == None or entry[0] is not referenced:
+			entry = (referenced, PointerType(referenced))
+			self._pointerTypes[id(referenced)] = entry
+		return entry[1]
 
 class MemoryBlock(metaclass=ABCMeta):
 	@abstractmethod
@@ -74,6 +93,8 @@ class MemoryBlock(metaclass=ABCMeta):
 	@abstractmethod
 	def EmitStore(self, emitter: Emitter, context): ...
 
+_emptySubBlocks: "Tuple[Tuple[str, MemoryBlock], ...]" = ()
+
 class Variable(MemoryBlock):
 	@abstractmethod
 	def GetType(self) -> Union[Type, str]: ...
@@ -91,8 +112,8 @@ class Variable(MemoryBlock):
 	def GetSubBlocks(self) -> "list[Tuple[str, MemoryBlock]]":
 		type = self.GetType()
 		if isinstance(type, str): raise TypeError("Variable must be resolved before collecting sub-blocks.")
-		elif isinstance(type, ComplexType): return [(field.GetName(), field) for field in type.GetFields()]
-		else: return []
+		elif isinstance(type, ComplexType): return type.GetSubBlocks()
+		else: return _emptySubBlocks
 	
 	def GetVariable(self, name: str):
 		type = self.GetType()
@@ -100,13 +121,9 @@ class Variable(MemoryBlock):
 		if name == None: return self
 		elif isinstance(type, str): raise Exception("Type is not resolved.")
 		elif isinstance(type, ComplexType):
-			path = name.split(".")
-
-			for i in range(len(type.GetFields())):
-				field = type.GetField(i, self)
-				if field != None and field.GetName() == path[0]:
-					if len(path) == 1: return field
-					else: return field.GetVariable(".".join(path[1:]))
+			first, separator, rest = name.partition(".")
+			field = type.GetField(first, self)
+			if field != None: return field if separator == "" else field.GetVariable(rest)
 
 		raise Exception("Undefined variable \"" + name + "\".")
 
@@ -154,14 +171,11 @@ class Parameter(Variable):
 	def IsByReference(self) -> bool: return self._ref
 	def Resolve(self, resolver: Resolver) -> None:
 		self._resolved = resolver.Resolve(self._type)
-		if self._ref: self._resolved = PointerType(self._resolved)
+		if self._ref: self._resolved = resolver.GetPointerType(self._resolved)
 
 	def EmitLoadAddress(self, emitter: Emitter, context):
-		offset = 2
-		for i in range(context.GetArgumentCount() - 1, self.GetIndex(), -1):
-			offset += context.GetArgument(i).GetType().GetSize()
 		emitter.ld_bp()
-		emitter.push(offset)
+		emitter.push(2 + context.GetArgumentOffset(self.GetIndex()))
 		emitter.add()
 		if self._ref: emitter.ld_ptr(self.GetSize())
 
@@ -178,22 +192,20 @@ class Local(Variable):
 		self._type = type
 		self._name = name
 		self._initial = initial
-	
+		self._frameOffset = 0
+
 	def CanRead(self) -> bool: return True
 	def CanWrite(self) -> bool: return True
 	def GetType(self) -> Union[Type, str]: return self._type
 	def GetName(self) -> str: return self._name
 	def GetInitialValue(self) -> Union[int, None]: return self._initial
+	def GetFrameOffset(self) -> int: return self._frameOffset
+	def SetFrameOffset(self, offset: int): self._frameOffset = offset
 	def Resolve(self, resolver: Resolver) -> None: self._type = resolver.Resolve(self._type)
 
 	def EmitLoadAddress(self, emitter: Emitter, context):
-		offset = 0
-		for i in range(context.GetLocalCount()):
-			local: Local = context.GetLocal(i)
-			offset += local.GetType().GetSize()
-			if local == self: break
 		emitter.ld_bp()
-		emitter.push(offset)
+		emitter.push(self._frameOffset)
 		emitter.sub()
 
 	def EmitLoad(self, emitter: Emitter, context):
@@ -216,11 +228,8 @@ class ReturnVariable(Variable):
 	def Resolve(self, resolver: Resolver) -> None: self._type = resolver.Resolve(self._type)
 
 	def EmitLoadAddress(self, emitter: Emitter, context):
-		offset = 2
-		for i in range(context.GetArgumentCount()):
-			offset += context.GetArgument(i).GetType().GetSize()
 		emitter.ld_bp()
-		emitter.push(offset)
+		emitter.push(2 + context.GetArgumentsSize())
 		emitter.add()
 
 	def EmitLoad(self, emitter: Emitter, context):
@@ -258,7 +267,7 @@ class PointerType(PrimitiveType):
 	def GetReferencedType(self) -> Union[Type, str]: return self._referenced
 	def Resolve(self, resolver: Resolver) -> None: self._referenced = resolver.Resolve(self._referenced)
 	def __eq__(self, __o: object) -> bool:
-		return isinstance(__o, PointerType) and self.GetReferencedType() == __o.GetReferencedType()
+		return self is __o or (isinstance(__o, PointerType) and self.GetReferencedType() == __o.GetReferencedType())
 	def __ne__(self, __o: object) -> bool:
 		return not (self == __o)
 
@@ -282,35 +291,51 @@ class ComplexType(Type):
 	def __init__(self, name: str, fields: "list[Field]"):
 		super().__init__(name)
 		self._fields = fields
-	def GetSize(self) -> int: return sum([field.GetType().GetSize() for field in self._fields])
+		self._subBlocks: "Tuple[Tuple[str, Field], ...]" = tuple((field.GetName(), field) for field in fields)
+		self._ClearLayout()
+	def GetSize(self) -> int:
+		if self._size == None: self._BuildLayout()
+		return self._size
 	def GetFields(self) -> "list[Field]": return self._fields
-	
+	def GetSubBlocks(self) -> "Tuple[Tuple[str, Field], ...]": return self._subBlocks
+
+	def _ClearLayout(self) -> None:
+		self._size: "Union[int, None]" = None
+		self._offsets: "list[int]" = []
+		self._fieldsByName: "dict[str, Tuple[int, int]]" = {}
+		self._fieldPool: "dict[Tuple[int, Union[Variable, None]], Field]" = {}
+
+	def _BuildLayout(self) -> None:
+		offset = 0
+		for i in range(len(self._fields)):
+			field = self._fields[i]
+			self._offsets.append(offset)
+			self._fieldsByName[field.GetName()] = (i, offset)
+			offset += field.GetType().GetSize()
+		self._size = offset
+
 	def GetField(self, nameOrIndex: Union[str, int], relativeTo: Union[Variable, None] = None) -> Union[Field, None]:
-		if isinstance(nameOrIndex, int):
-			offset = 0
-			for i in range(nameOrIndex): offset += self._fields[i].GetSize()
-			field = self._fields[nameOrIndex]
-			return Field(relativeTo, field.GetType(), field.GetName(), field.GetIndex(), offset)
-		elif isinstance(nameOrIndex, str):
-			offset = 0
-			for field in self._fields:
-				if field.GetName() == nameOrIndex:
-					return Field(relativeTo, field.GetType(), field.GetName(), field.GetIndex(), offset)
-				else:
-					offset += field.GetSize()
-		return None
-	
+		if self._size == None: self._BuildLayout()
+		if isinstance(nameOrIndex, int): index = nameOrIndex
+		elif isinstance(nameOrIndex, str) and nameOrIndex in self._fieldsByName: index = self._fieldsByName[nameOrIndex][0]
+		else: return None
+		key = (index, relativeTo)
+		if key not in self._fieldPool:
+			field = self._fields[index]
+			self._fieldPool[key] = Field(relativeTo, field.GetType(), field.GetName(), field.GetIndex(), self._offsets[index])
+		return self._fieldPool[key]
+
 	def GetFieldOffset(self, name: str) -> Union[int, None]:
-		offset = 0
-		for field in self._fields:
-			if field.GetName() == name: return offset
-			else: offset += field.GetType().GetSize()
-		return None
-	
+		if self._size == None: self._BuildLayout()
+		entry = self._fieldsByName.get(name)
+		return None if entry == None else entry[1]
+
 	def Resolve(self, resolver: Resolver) -> None:
 		for field in self._fields: field.Resolve(resolver, self)
+		self._ClearLayout()
 
 class Expression(metaclass=ABCMeta):
+	__slots__ = ()
 	@abstractmethod
 	def Resolve(self, resolver: Resolver, context) -> None: ...
 	@abstractmethod
@@ -319,11 +344,13 @@ class Expression(metaclass=ABCMeta):
 	def Emit(self, emitter: Emitter, context) -> None: ...
 
 class VoidExpression(Expression):
+	__slots__ = ()
 	def Resolve(self, resolver: Resolver, context): return
 	def GetResultType(self) -> Type: return VoidType
 	def Emit(self, emitter: Emitter, context): return
 
 class ConstantExpression(Expression):
+	__slots__ = ("_value", "_type")
 	def __init__(self, value: int, type: Union[Type, str]):
 		self._value = value
 		self._type = type
@@ -335,6 +362,7 @@ class ConstantExpression(Expression):
 		emitter.push(self._value)
 
 class VariableExpression(Expression):
+	__slots__ = ("_target",)
 	def __init__(self, target: str):
 		self._target = target
 	
@@ -357,9 +385,11 @@ class VariableExpression(Expression):
 		else: raise Exception("Type is not resolved.")
 
 class UnaryOperandExpression(Expression):
+	__slots__ = ("_operator", "_expr", "_operationName", "_call")
 	def __init__(self, operator: str, expr: Expression):
 		self._operator = operator
 		self._expr = expr
+		self._operationName = None
 		self._call = None
 
 	def Resolve(self, resolver: Resolver, context):
@@ -368,8 +398,10 @@ class UnaryOperandExpression(Expression):
 		self._call.Resolve(resolver, context)
 
 	def GetOperationName(self) -> str:
-		type = self._expr.GetResultType()
-		return _operators[self._operator][2].replace("TYPE1", type.GetName())
+		if self._operationName == None:
+			type = self._expr.GetResultType()
+			self._operationName = get_operation_name(_operators[self._operator].operation, type.GetName())
+		return self._operationName
 
 	def GetResultType(self) -> Type:
 		if self._call == None: raise Exception("Expression has not been resolved.")
@@ -380,10 +412,12 @@ class UnaryOperandExpression(Expression):
 		self._call.Emit(emitter, context)
 
 class BinaryOperandExpression(Expression):
+	__slots__ = ("_operator", "_exprA", "_exprB", "_operationName", "_call")
 	def __init__(self, operator: str, exprA: Expression, exprB: Expression):
 		self._operator = operator
 		self._exprA = exprA
 		self._exprB = exprB
+		self._operationName = None
 		self._call = None
 
 	def Resolve(self, resolver: Resolver, context):
@@ -393,9 +427,11 @@ class BinaryOperandExpression(Expression):
 		self._call.Resolve(resolver, context)
 	
 	def GetOperationName(self) -> str:
-		a = self._exprA.GetResultType()
-		b = self._exprB.GetResultType()
-		return _operators[self._operator][2].replace("TYPE1", a.GetName()).replace("TYPE2", b.GetName())
+		if self._operationName == None:
+			a = self._exprA.GetResultType()
+			b = self._exprB.GetResultType()
+			self._operationName = get_operation_name(_operators[self._operator].operation, a.GetName(), b.GetName())
+		return self._operationName
 
 	def GetResultType(self) -> Type:
 		if self._call == None: raise Exception("Expression has not been resolved.")
@@ -406,9 +442,11 @@ class BinaryOperandExpression(Expression):
 		self._call.Emit(emitter, context)
 
 class CastExpression(Expression):
+	__slots__ = ("_type", "_expr", "_operationName", "_call")
 	def __init__(self, type: Union[Type, str], expr: Expression):
 		self._type = type
 		self._expr = expr
+		self._operationName = None
 		self._call = None
 
 	def Resolve(self, resolver: Resolver, context):
@@ -418,7 +456,9 @@ class CastExpression(Expression):
 		self._call.Resolve(resolver, context)
 
 	def GetOperationName(self) -> str:
-		return f"__CAST_{self._expr.GetResultType().GetName()}_{self._type.GetName()}"
+		if self._operationName == None:
+			self._operationName = get_operation_name("CAST", self._expr.GetResultType().GetName(), self._type.GetName())
+		return self._operationName
 
 	def GetResultType(self) -> Type:
 		if self._call == None: raise Exception("Expression has not been resolved.")
@@ -429,16 +469,24 @@ class CastExpression(Expression):
 		self._call.Emit(emitter, context)
 
 class CallExpression(Expression):
+	__slots__ = ("_target", "_addressOf", "_valueOf", "_args", "_emit", "_returnSize", "_argsSize")
 	def __init__(self, target: "Union[Callable, str]", args: "list[Expression]"):
 		self._target = target
 		self._addressOf = isinstance(target, str) and target.upper() == "ADDRESSOF"
 		self._valueOf = isinstance(target, str) and target.upper() == "VALUEOF"
 		self._args = args
+		self._emit = None
+		self._returnSize: "Union[int, None]" = None
+		self._argsSize: "Union[int, None]" = None
 
 	def Resolve(self, resolver: Resolver, context):
 		for arg in self._args: arg.Resolve(resolver, context)
 		if not (isinstance(self._target, Callable) or self._addressOf or self._valueOf):
 			self._target = resolver.GetFunction(self._target)
+		if self._addressOf: self._emit = self._EmitAddressOf
+		elif self._valueOf: self._emit = self._EmitValueOf
+		elif self._target.IsInline(): self._emit = self._EmitInline
+		else: self._emit = self._EmitCall
 	
 	def GetResultType(self) -> Type:
 		if self._addressOf: return self.GetAddressOfType()
@@ -457,36 +505,41 @@ class CallExpression(Expression):
 		else: return VoidType
 
 	def Emit(self, emitter: Emitter, context):
-		if self._addressOf:
-			if len(self._args) != 1: raise Exception("Expected 1 operand for \"ADDRESSOF\" operator.")
-			expr = self._args[0]
-			if not isinstance(expr, VariableExpression):
-				raise Exception("Expression does not have an address.")
-			expr.GetVariable().EmitLoadAddress(emitter, context)
-		elif self._valueOf:
-			if len(self._args) != 1: raise Exception("Expected 1 operand for \"VALUEOF\" operator.")
-			expr = self._args[0]
-			type = expr.GetResultType()
-			if not isinstance(type, PointerType):
-				raise Exception("Expression does not have a referenced value.")
-			expr.Emit(emitter, context)
-			emitter.ld_ptr(type.GetSize())
-		else:
-			if not isinstance(self._target, Callable): raise Exception("Function is not resolved.")
-			if self._target.IsInline():
-				for arg in self._args: arg.Emit(emitter, context)
-				self._target.Emit(emitter)
-			else:
-				if self._target.GetReturnType().GetSize() > 0:
-					emitter.add_sp(self._target.GetReturnType().GetSize())
-				size = 0
-				for arg in self._args:
-					arg.Emit(emitter, context)
-					size += arg.GetResultType().GetSize()
-				emitter.call(self._target.GetName())
-				if size > 0: emitter.rem_sp(size)
+		if self._emit == None: raise Exception("Function is not resolved.")
+		self._emit(emitter, context)
+
+	def _EmitAddressOf(self, emitter: Emitter, context):
+		if len(self._args) != 1: raise Exception("Expected 1 operand for \"ADDRESSOF\" operator.")
+		expr = self._args[0]
+		if not isinstance(expr, VariableExpression):
+			raise Exception("Expression does not have an address.")
+		expr.GetVariable().EmitLoadAddress(emitter, context)
+
+	def _EmitValueOf(self, emitter: Emitter, context):
+		if len(self._args) != 1: raise Exception("Expected 1 operand for \"VALUEOF\" operator.")
+		expr = self._args[0]
+		type = expr.GetResultType()
+		if not isinstance(type, PointerType):
+			raise Exception("Expression does not have a referenced value.")
+		expr.Emit(emitter, context)
+		emitter.ld_ptr(type.GetSize())
+
+	def _EmitInline(self, emitter: Emitter, context):
+		for arg in self._args: arg.Emit(emitter, context)
+		self._target.Emit(emitter)
+
+	def _EmitCall(self, emitter: Emitter, context):
+		if self._argsSize == None:
+			self._returnSize = self._target.GetReturnType().GetSize()
+			self._argsSize = 0
+			for arg in self._args: self._argsSize += arg.GetResultType().GetSize()
+		if self._returnSize > 0: emitter.add_sp(self._returnSize)
+		for arg in self._args: arg.Emit(emitter, context)
+		emitter.call(self._target.GetName())
+		if self._argsSize > 0: emitter.rem_sp(self._argsSize)
 
 class Statement(metaclass=ABCMeta):
+	__slots__ = ()
 	@abstractmethod
 	def GetLocals(self) -> "list[Local]": ...
 	@abstractmethod
@@ -495,6 +548,7 @@ class Statement(metaclass=ABCMeta):
 	def Emit(self, emitter: Emitter, context) -> None: ...
 
 class LocalStatement(Statement):
+	__slots__ = ("_local",)
 	def __init__(self, local: Local):
 		self._local = local
 
@@ -503,6 +557,7 @@ class LocalStatement(Statement):
 	def Emit(self, emitter: Emitter, context): return
 
 class AssignmentStatement(Statement):
+	__slots__ = ("_target", "_expr")
 	def __init__(self, target: Union[Variable, str], expr: Expression):
 		self._target = target
 		self._expr = expr
@@ -516,6 +571,7 @@ class AssignmentStatement(Statement):
 		else: context.GetVariable(self._target).EmitStore(emitter, context)
 
 class ReturnStatement(Statement):
+	__slots__ = ("_expr",)
 	def __init__(self, expr: Expression):
 		self._expr = expr
 	
@@ -526,10 +582,11 @@ class ReturnStatement(Statement):
 		if self._expr.GetResultType() != context.GetReturnType():
 			raise Exception("Return value does not match function return type.")
 		self._expr.Emit(emitter, context)
-		ReturnVariable(self._expr.GetResultType()).EmitStore(emitter, context)
+		context.GetReturnVariable().EmitStore(emitter, context)
 		emitter.jmp(f"__{context.GetName()}__return")
 
 class AssemblyLoadStatement(Statement):
+	__slots__ = ("_source",)
 	def __init__(self, source: Union[Variable, str]):
 		self._source = source
 	
@@ -541,6 +598,7 @@ class AssemblyLoadStatement(Statement):
 		else: context.GetVariable(self._source).EmitLoad(emitter, context)
 
 class AssemblyStoreStatement(Statement):
+	__slots__ = ("_source",)
 	def __init__(self, source: Union[Variable, str]):
 		self._source = source
 	
@@ -552,6 +610,7 @@ class AssemblyStoreStatement(Statement):
 		else: context.GetVariable(self._source).EmitStore(emitter, context)
 
 class AssemblyInstructionStatement(Statement):
+	__slots__ = ("_operation", "_operands")
 	def __init__(self, operation: str, operands: "list[str]"):
 		self._operation = operation
 		self._operands = operands
@@ -561,6 +620,7 @@ class AssemblyInstructionStatement(Statement):
 	def Emit(self, emitter: Emitter, context): emitter.emit_raw(self._operation, self._operands)
 
 class CallStatement(Statement):
+	__slots__ = ("_expr",)
 	def __init__(self, expr: CallExpression):
 		self._expr = expr
 
@@ -575,9 +635,20 @@ class CallStatement(Statement):
 class Callable(metaclass=ABCMeta):
 	def __init__(self, name: str):
 		self._name = name
+		self._argOffsets: "Union[list[int], None]" = None
+		self._argsSize = 0
+		self._localsSize = 0
+		self._variables: "Union[dict[str, Variable], None]" = None
+		self._returnVariable: "Union[ReturnVariable, None]" = None
 	
 	def GetName(self) -> str: return self._name
 	def IsInline(self) -> bool: return False
+	def GetArgumentOffset(self, index: int) -> int:
+		self._EnsureFrame()
+		return self._argOffsets[index]
+	def GetReturnVariable(self) -> ReturnVariable:
+		if self._returnVariable == None: self._returnVariable = ReturnVariable(self.GetReturnType())
+		return self._returnVariable
 	@abstractmethod
 	def GetArgumentsSize(self) -> int: ...
 	@abstractmethod
@@ -597,18 +668,33 @@ class Callable(metaclass=ABCMeta):
 	@abstractmethod
 	def Resolve(self, resolver: Resolver) -> None: ...
 
-	def GetVariable(self, name: str) -> Variable:
-		parts = name.split(".")
+	def _EnsureFrame(self) -> None:
+		if self._argOffsets == None: self._BuildFrame()
 
+	def _BuildFrame(self) -> None:
+		offset = 0
+		self._argOffsets = [0] * self.GetArgumentCount()
+		for i in range(self.GetArgumentCount() - 1, -1, -1):
+			self._argOffsets[i] = offset
+			offset += self.GetArgument(i).GetType().GetSize()
+		self._argsSize = offset
+		offset = 0
 		for i in range(self.GetLocalCount()):
-			if self.GetLocal(i).GetName() == parts[0]:
-				if len(parts) == 1: return self.GetLocal(i)
-				else: return self.GetLocal(i).GetVariable(".".join(parts[1:]))
-		
-		for i in range(self.GetArgumentCount()):
-			if self.GetArgument(i).GetName() == parts[0]:
-				if len(parts) == 1: return self.GetArgument(i)
-				else: return self.GetArgument(i).GetVariable(".".join(parts[1:]))
+			local = self.GetLocal(i)
+			offset += local.GetType().GetSize()
+			local.SetFrameOffset(offset)
+		self._localsSize = offset
+
+	def GetVariable(self, name: str) -> Variable:
+		if self._variables == None:
+			self._variables = {}
+			for i in range(self.GetLocalCount()): self._variables.setdefault(self.GetLocal(i).GetName(), self.GetLocal(i))
+			for i in range(self.GetArgumentCount()): self._variables.setdefault(self.GetArgument(i).GetName(), self.GetArgument(i))
+
+		first, separator, rest = name.partition(".")
+		variable = self._variables.get(first)
+		if variable == None or separator == "": return variable
+		else: return variable.GetVariable(rest)
 
 	def Emit(self, emitter: Emitter):
 		label = emitter.create_label(self.GetName())
@@ -620,8 +706,7 @@ class Callable(metaclass=ABCMeta):
 			local = self.GetLocal(i)
 			value = local.GetInitialValue()
 			if value == None: emitter.add_sp(local.GetType().GetSize())
-			else:
-				for _ in local.GetType().GetSize(): emitter.push(value)
+			else: emitter.push_fill(value, local.GetType().GetSize())
 		for statement in self.GetBody(): statement.Emit(emitter, self)
 		emitter.mark_label(emitter.create_label(f"__{self.GetName()}__return"))
 		emitter.ld_bp()
@@ -663,30 +748,25 @@ class SubRoutine(Callable):
 			self._namedArgs.append(Parameter(type, ref, name, i))
 			i += 1
 		self._body = body
+		self._locals: "list[Local]" = [local for statement in body for local in statement.GetLocals()]
 	
-	def GetArgumentsSize(self) -> int: return sum([param.GetType().GetSize() for param in self._namedArgs])
+	def GetArgumentsSize(self) -> int:
+		self._EnsureFrame()
+		return self._argsSize
 	def GetArgumentCount(self) -> int: return len(self._namedArgs)
 	def GetArgument(self, index: int) -> Parameter: return self._namedArgs[index]
 	def GetLocalsSize(self) -> int:
-		result = 0
-		for statement in self._body:
-			for local in statement.GetLocals():
-				result += local.GetType().GetSize()
-		return result
-	def GetLocalCount(self) -> int: return sum([len(statement.GetLocals()) for statement in self._body])
-	def GetLocal(self, index: int) -> Local:
-		offset = index
-		for statement in self._body:
-			for local in statement.GetLocals():
-				if offset == 0: return local
-				offset -= 1
-		raise IndexError()
+		self._EnsureFrame()
+		return self._localsSize
+	def GetLocalCount(self) -> int: return len(self._locals)
+	def GetLocal(self, index: int) -> Local: return self._locals[index]
 	def GetReturnType(self) -> Type: return VoidType
 	def GetBody(self) -> "list[Statement]": return self._body
 	
 	def Resolve(self, resolver: Resolver) -> None:
 		for arg in self._namedArgs: arg.Resolve(resolver)
 		for statement in self.GetBody(): statement.Resolve(resolver, self)
+		self._BuildFrame()
 
 class Function(Callable):
 	def __init__(self, name: str, args: "list[Tuple[Union[Type, str], str]]", returnType: "Union[Type, str]", body: "list[Statement]"):
@@ -698,24 +778,18 @@ class Function(Callable):
 			i += 1
 		self._returnType = returnType
 		self._body = body
+		self._locals: "list[Local]" = [local for statement in body for local in statement.GetLocals()]
 	
-	def GetArgumentsSize(self) -> int: return sum([param.GetType().GetSize() for param in self._namedArgs])
+	def GetArgumentsSize(self) -> int:
+		self._EnsureFrame()
+		return self._argsSize
 	def GetArgumentCount(self) -> int: return len(self._namedArgs)
 	def GetArgument(self, index: int) -> Parameter: return self._namedArgs[index]
 	def GetLocalsSize(self) -> int:
-		result = 0
-		for statement in self._body:
-			for local in statement.GetLocals():
-				result += local.GetType().GetSize()
-		return result
-	def GetLocalCount(self) -> int: return sum([len(statement.GetLocals()) for statement in self._body])
-	def GetLocal(self, index: int) -> Local:
-		offset = index
-		for statement in self._body:
-			for local in statement.GetLocals():
-				if offset == 0: return local
-				offset -= 1
-		raise IndexError()
+		self._EnsureFrame()
+		return self._localsSize
+	def GetLocalCount(self) -> int: return len(self._locals)
+	def GetLocal(self, index: int) -> Local: return self._locals[index]
 	def GetReturnType(self) -> Type:
 		if isinstance(self._returnType, Type): return self._returnType
 		else: raise Exception("Type is not resolved.")
@@ -725,6 +799,7 @@ class Function(Callable):
 		self._returnType = resolver.Resolve(self._returnType)
 		for arg in self._namedArgs: arg.Resolve(resolver)
 		for statement in self.GetBody(): statement.Resolve(resolver, self)
+		self._BuildFrame()
 
 class Module:
 	def __init__(self, name: str, types: "list[Type]", code: "list[Callable]"):
@@ -745,294 +820,3 @@ class Module:
 
 	def Emit(self, emitter: Emitter):
 		for code in self._code: code.Emit(emitter)
-
-_statements = {}
-_blocks = {}
-
-def parse_value(text: str) -> int:
-	match = re.match(r"^\-?((0X[0-9A-F]+)|(0O[0-7]+)|(0B[01]+)|([1-9][0-9]+)|([0-9]))$", text.upper())
-	negate = False
-	result = 0
-	if match == None: raise Exception("Invalid value.")
-	if text.startswith("-"):
-		negate = True
-		text = text[1:]
-	if text.startswith("0X"): result = int(text[2:], base=16)
-	elif text.startswith("0O"): result = int(text[2:], base=8)
-	elif text.startswith("0B"): result = int(text[2:], base=2)
-	else: result = int(text)
-	return -result if negate else result
-
-def parse_local(line: str) -> Local:
-	match = re.match(r"^[Dd][Ii][Mm]\s+(\w[\w\d]*)\s+[Aa][Ss]\s+(\w[\w\d]*)\s*(=\s*(.+))?$", line.strip())
-	if match == None: raise Exception("Invalid local declaration. Example: Dim value As Integer = 10")
-	name = match.group(1)
-	type = match.group(2)
-	initial = match.group(4)
-	if initial != None: initial = parse_value(initial.strip())
-	return Local(type, name, initial)
-
-def parse_local_statement(line: str) -> LocalStatement:
-	return LocalStatement(parse_local(line))
-
-def parse_field(line: str, index: int) -> Field:
-	match = re.match(r"^DIM\s+(\w[\w\d]*)\s+AS\s+(\w[\w\d]*)$", line.strip(), re.IGNORECASE)
-	if match == None: raise Exception("Invalid field declaration. Example: Dim value As Integer")
-	name = match.group(1)
-	type = match.group(2)
-	return Field(None, type, name, index)
-
-def parse_struct(lines: "list[str]") -> ComplexType:
-	if len(lines) < 2: raise Exception("Invalid structure.")
-	header = re.match(r"^STRUCTURE\s+(\w[\w\d]*)$", lines[0].strip(), re.IGNORECASE)
-	footer = re.match(r"^END\s+STRUCTURE$", lines[len(lines) - 1].strip(), re.IGNORECASE)
-	if header == None: raise Exception("Invalid structure header. Example: Structure MyData")
-	if footer == None: raise Exception("Invalid structure footer. Example: End Structure")
-	offset = -1
-	fields = []
-	for i in range(1, len(lines) - 1):
-		if len(lines[i].strip()) > 0:
-			fields.append(parse_field(lines[i], i + offset))
-		else:
-			offset -= 1
-	return ComplexType(header.group(1), fields)
-
-def parse_arguments(argList: str) -> "list[Tuple[Union[Type, str], str, bool]]":
-	result = []
-	if len(argList.strip()) == 0: return result
-	for arg in [arg.strip() for arg in argList.split(",")]:
-		match = re.match(r"^(?:(BYREF)\s+)?(\w[\w\d]*)\s+AS\s+(\w[\w\d\*]*)$", arg, re.IGNORECASE)
-		if match == None: raise Exception("Invalid argument. Example: value As Integer")
-		result.append((match.group(3), match.group(2), str(match.group(1)).upper() == "BYREF"))
-	return result
-
-def parse_subroutine(lines: "list[Union[str, list]]") -> SubRoutine:
-	if len(lines) < 2: raise Exception("Invalid subroutine.")
-	header = re.match(r"^SUB\s+(\w[\w\d]*)\s*\((\s*(?:(?:\s*(?:BYREF\s+)?\w[\w\d]*\s+AS\s+\w[\w\d\*]*\s*,)*\s*(?:BYREF\s+)?\w[\w\d]*\s+AS\s+\w[\w\d\*]*\s*)?)\)$", lines[0].strip(), re.IGNORECASE)
-	footer = re.match(r"^END\s+SUB$", lines[len(lines) - 1].strip(), re.IGNORECASE)
-	if header == None: raise Exception("Invalid subroutine header. Example: Sub MyCode(a As Integer, b As Integer)")
-	if footer == None: raise Exception("Invalid subroutine footer. Example: End Sub")
-	statements = []
-	for i in range(1, len(lines) - 1):
-		statement = parse_statement(lines[i])
-		if statement != None: statements.append(statement)
-	return SubRoutine(header.group(1), parse_arguments(header.group(2)), statements)
-
-def parse_function(lines: "list[Union[str, list]]") -> Function:
-	if len(lines) < 2: raise Exception("Invalid function.")
-	header = re.match(r"^FUNCTION\s+(\w[\w\d]*)\s*\((\s*(?:(?:\s*(?:BYREF\s+)?\w[\w\d]*\s+AS\s+\w[\w\d\*]*\s*,)*\s*(?:BYREF\s+)?\w[\w\d]*\s+AS\s+\w[\w\d\*]*\s*)?)\)\s+AS\s+(\w[\w\d\*]*)$", lines[0].strip(), re.IGNORECASE)
-	footer = re.match(r"^END\s+FUNCTION$", lines[len(lines) - 1].strip(), re.IGNORECASE)
-	if header == None: raise Exception("Invalid function header. Example: Function MyCode(a As Integer, b As Integer) As Integer")
-	if footer == None: raise Exception("Invalid function footer. Example: End Function")
-	statements = []
-	for i in range(1, len(lines) - 1):
-		statement = parse_statement(lines[i])
-		if statement != None: statements.append(statement)
-	return Function(header.group(1), parse_arguments(header.group(2)), header.group(3), statements)
-
-def collect_blocks(lines: "list[str]", isRootBlock=False) -> "Tuple[list[Union[str, list]], int]":
-	result = []
-	i = 0
-	blockName = ""
-	while i < len(lines):
-		innerBlock = False
-		if i == 0 and not isRootBlock:
-			header = re.match(r"^(\w+)", lines[0].strip())
-			if header == None: raise Exception("Invalid block header.")
-			blockName = header.group(1).upper()
-		else:
-			for key in _blocks:
-				if lines[i].upper().strip().startswith(key):
-					block, length = collect_blocks(lines[i:])
-					result.append(block)
-					i += length
-					innerBlock = True
-					break
-		if not innerBlock:
-			line = lines[i]
-			result.append(line)
-			i += 1
-			if not isRootBlock:
-				footer = re.search("^END\\s+" + blockName + "$", line.strip(), re.IGNORECASE)
-				if footer != None: return result, i
-	if isRootBlock:
-		return result, i
-	else:
-		raise Exception("\"" + blockName + "\" block is missing \"END " + blockName + "\"")
-
-def parse_expression(line: str) -> Expression:
-	tokens = re.findall(r"(?:\w[\w\d\.\*]*\(?)|(?:\-?\d[\w\d\.]*)|(?:\s+)|(?:[\+\-\*\/\.]+|(?:AS))|(?:\()|(?:\))", line, re.IGNORECASE)
-	queue = []
-	stack = []
-
-	def isOperator(name: str) -> bool: return (name.upper() == "AS") or (name.upper() in _operators)
-	def getPrecedence(name: str) -> int: return _operators[name][0]
-	def isLeftAssociative(name: str) -> bool: return _operators[name][1]
-
-	for token in tokens:
-		if token.isspace(): continue
-		if isOperator(token):
-			while (len(stack) > 0) and (stack[len(stack) - 1] != "(") and ((getPrecedence(stack[len(stack) - 1]) > getPrecedence(token)) or (isLeftAssociative(token) and getPrecedence(stack[len(stack) - 1]) == getPrecedence(token))):
-				queue.append(stack.pop())
-			stack.append(token)
-		elif len(token) > 1 and token.endswith("("):
-			stack.append(token)
-			stack.append("(")
-			queue.append(")")
-		elif token == "(":
-			stack.append("(")
-		elif token == ")":
-			if len(stack) == 0: raise Exception("Missing \"(\".")
-			while stack[len(stack) - 1] != "(":
-				if len(stack) == 0: raise Exception("Missing \"(\".")
-				queue.append(stack.pop())
-			stack.pop()
-			if len(stack) > 0:
-				top = stack[len(stack) - 1]
-				if len(top) > 0 and top.endswith("("):
-					queue.append(stack.pop())
-		else:
-			queue.append(token)
-
-	while len(stack) > 0:
-		token = stack.pop()
-		if token == "(": raise Exception("Missing \")\".")
-		queue.append(token)
-	
-	for token in queue:
-		if token == ")":
-			stack.append(token)
-		elif isOperator(token):
-			if token.upper() == "AS":
-				if len(stack) < 1: raise Exception("Expected 2 operands for \"" + token + "\" operator.")
-				type = stack.pop()
-				expr = stack.pop()
-				if not isinstance(type, VariableExpression): raise Exception("Expected type name for second operand of \"AS\".")
-				stack.append(CastExpression(type.GetName(), expr))
-			else:
-				argCount = _operators[token][3]
-				if argCount == 1:
-					if len(stack) < 1: raise Exception("Expected 1 operand for \"" + token + "\" operator.")
-					stack.append(UnaryOperandExpression(token, stack.pop()))
-				elif argCount == 2:
-					if len(stack) < 2: raise Exception("Expected 2 operands for \"" + token + "\" operator.")
-					argB = stack.pop()
-					argA = stack.pop()
-					stack.append(BinaryOperandExpression(token, argA, argB))
-		elif token.endswith("(") and len(token) > 1:
-			args = []
-			if len(stack) == 0: raise Exception("Invalid call expression.")
-			while stack[len(stack) - 1] != ")":
-				args.append(stack.pop())
-				if len(stack) == 0: raise Exception("Missing argument list terminator.")
-			stack.pop()
-			args.reverse()
-			stack.append(CallExpression(token[:len(token) - 1], args))
-		else:
-			try:
-				stack.append(ConstantExpression(parse_value(token), "Integer"))
-			except:
-				stack.append(VariableExpression(token))
-	
-	if len(stack) != 1: raise Exception("Expressions must produce one value.")
-	return stack[0]
-
-def parse_asm_statement(line: str) -> Statement:
-	match = re.match(r"^\s*ASM\s+(\w+)\s+([\w\d\.]+)(?:\s+(.*)\s*)?", line, re.IGNORECASE)
-	if match == None: raise Exception("Invalid assembly statement.")
-	if match.group(1).upper() == "LOAD":
-		if match.group(3) == "": return AssemblyLoadStatement(match.group(2))
-		else: raise Exception("Assembly load statement only accepts 1 parameter.")
-	elif match.group(1).upper() == "SAVE":
-		if match.group(3) == "": return AssemblyStoreStatement(match.group(2))
-		else: raise Exception("Assembly save statement only accepts 1 parameter.")
-	elif match.group(1).upper() == "EXEC":
-		if match.group(3) == "": return AssemblyInstructionStatement(match.group(2), [])
-		else: return AssemblyInstructionStatement(match.group(2), re.split("\s+", match.group(3)))
-	else:
-		raise Exception("Unrecognized assembly statement type.")
-
-def parse_return_statement(line: str) -> ReturnStatement:
-	match = re.match(r"^\s*RETURN(?:\s+(.*))?\s*$", line, re.IGNORECASE)
-	if match == None: raise Exception("Invalid return statement.")
-	expression = match.group(1)
-	if expression == "": return ReturnStatement(VoidExpression())
-	else: return ReturnStatement(parse_expression(expression))
-
-def parse_assign_statement(line: str) -> AssignmentStatement:
-	match = re.match(r"^\s*(\w[\w\d\.]*)\s*=\s*(.*)", line)
-	if match == None: raise Exception("Invalid assignment statement.")
-	target = match.group(1)
-	expression = match.group(2)
-	return AssignmentStatement(target, parse_expression(expression))
-
-def parse_call_statement(line: str) -> CallStatement:
-	expression = parse_expression(line)
-	if isinstance(expression, CallExpression): return CallStatement(expression)
-	else: raise Exception("Inline statement must be call or assignment.")
-
-def parse_inline_statement(line: str) -> Statement:
-	match = re.match(r"^\s*(\w[\w\d\.]*)\s*=\s*(.*)", line)
-	if match != None: return parse_assign_statement(line)
-	match = re.match(r"^\s*(\w[\w\d\.]*)\s*\(", line)
-	if match != None: return parse_call_statement(line)
-	raise Exception("Invalid inline statement.")
-
-def parse_statement(statement: Union[str, list]) -> Union[Statement, None]:
-	if isinstance(statement, str):
-		if len(statement.strip()) > 0:
-			for key in _statements:
-				if re.match("^\\s*" + key + "(\\s+.*)?$", statement, re.IGNORECASE) != None:
-					return _statements[key](statement)
-			return parse_inline_statement(statement)
-		else:
-			return None
-	else:
-		for key in _blocks:
-			if re.match("^\\s*END\s+" + key + "\\s*$", statement[len(statement) - 1], re.IGNORECASE) != None:
-				return _blocks[key](statement)
-		raise Exception("Unknown block type or missing end statement.")
-
-def parse_module(name: str, lines: "list[str]") -> Module:
-	blockTree = collect_blocks(lines, True)[0]
-
-	for i in range(len(blockTree)):
-		if isinstance(blockTree[i], str) and len(blockTree[i].strip()) == 0: blockTree[i] = None
-		else: blockTree[i] = parse_statement(blockTree[i])
-
-	types = []
-	code = []
-	for info in blockTree:
-		if isinstance(info, Type): types.append(info)
-		elif isinstance(info, Callable): code.append(info)
-		elif info == None: pass
-		else: raise Exception(type(info).__name__ + " is not valid at the root level.")
-
-	return Module(name, types, code)
-
-def parse_file(file: str) -> Module:
-	name = os.path.basename(file)
-
-	if "." in name: name = re.sub(r"\.[^\.]+$", "", name)
-
-	nameMatch = re.match(r"\w[\w\d]*", name)
-	if nameMatch == None: raise Exception("Invalid module name \"" + name + "\".")
-
-	stream = open(file, "r")
-	lines = stream.readlines()
-	stream.close()
-
-	return parse_module(name, lines)
-
-_statements["CALL"] = None
-_statements["RETURN"] = parse_return_statement
-_statements["DIM"] = parse_local_statement
-_statements["ASM"] = parse_asm_statement
-
-_blocks["SUB"] = parse_subroutine
-_blocks["FUNCTION"] = parse_function
-_blocks["STRUCTURE"] = parse_struct
-_blocks["IF"] = None
-_blocks["WHILE"] = None
-_blocks["FOR"] = None
-_blocks["TRY"] = None
\ No newline at end of file
@@ -1,14 +1,9 @@
-from abc import abstractmethod
-
-def _get_abstract_methods(object):
-	result = []
-	for member in dir(object):
-		method = getattr(object, member)
-		if callable(method) and getattr(method, "__isabstractmethod__", False):
-			result.append(member)
-	return result
+from abc import ABCMeta, abstractmethod
+from enum import IntEnum
 
 class Label:
+	__slots__ = ("_name", "_address")
+
 	def __init__(self, name="", address=None):
 		self._name = name
 		self._address = address
@@ -28,12 +23,19 @@ class Label:
 	def is_marked(self):
 		return self._address != None
 
-class Emitter():
-	def __init__(self):
-		abstracts = _get_abstract_methods(self)
-		if len(abstracts) > 0:
-			raise NotImplementedError("The following members have not been implemented: " + ", ".join(abstracts))
+class Comparison(IntEnum):
+	EQ = 0
+	NE = 1
+	LT_S = 2
+	LT_U = 3
+	GT_S = 4
+	GT_U = 5
+	LE_S = 6
+	LE_U = 7
+	GE_S = 8
+	GE_U = 9
 
+class Emitter(metaclass=ABCMeta):
 	@abstractmethod
 	def emit_raw(self, operation, operands):
 		"""Emit the specified raw instruction."""
@@ -46,6 +48,10 @@ class Emitter():
 	def push(self, immediate):
 		"""Push the specified immediate to the stack."""
 
+	def push_fill(self, immediate, count):
+		"""Push the specified immediate to the stack the specified number of times."""
+		for _ in range(count): self.push(immediate)
+
 	@abstractmethod
 	def pop(self):
 		"""Pop value from the stack."""
@@ -107,44 +113,48 @@ class Emitter():
 		"""Pop value2 and value1 from the stack and push the right shifted result."""
 
 	@abstractmethod
+	def compare(self, comparison):
+		"""Pop value2 and value1 from the stack and push the result of the specified comparison."""
+
 	def cmp_eq(self):
 		"""Pop value2 and value1 from the stack and push the equality comparison."""
+		self.compare(Comparison.EQ)
 
-	@abstractmethod
 	def cmp_ne(self):
 		"""Pop value2 and value1 from the stack and push the inequality comparison."""
+		self.compare(Comparison.NE)
 
-	@abstractmethod
 	def cmp_lt_s(self):
 		"""Pop value2 and value1 from the stack and push the signed less than comparison."""
+		self.compare(Comparison.LT_S)
 
-	@abstractmethod
 	def cmp_lt_u(self):
 		"""Pop value2 and value1 from the stack and push the unsigned less than comparison."""
+		self.compare(Comparison.LT_U)
 
-	@abstractmethod
 	def cmp_gt_s(self):
 		"""Pop value2 and value1 from the stack and push the signed greater than comparison."""
+		self.compare(Comparison.GT_S)
 
-	@abstractmethod
 	def cmp_gt_u(self):
 		"""Pop value2 and value1 from the stack and push the unsigned greater than comparison."""
+		self.compare(Comparison.GT_U)
 
-	@abstractmethod
 	def cmp_le_s(self):
 		"""Pop value2 and value1 from the stack and push the signed less than or equal comparison."""
+		self.compare(Comparison.LE_S)
 
-	@abstractmethod
 	def cmp_le_u(self):
 		"""Pop value2 and value1 from the stack and push the unsigned less than or equal comparison."""
+		self.compare(Comparison.LE_U)
 
-	@abstractmethod
 	def cmp_ge_s(self):
 		"""Pop value2 and value1 from the stack and push the signed greater than or equal comparison."""
+		self.compare(Comparison.GE_S)
 
-	@abstractmethod
 	def cmp_ge_u(self):
 		"""Pop value2 and value1 from the stack and push the unsigned greater than or equal comparison."""
+		self.compare(Comparison.GE_U)
 
 	@abstractmethod
 	def call(self, target):
@@ -167,44 +177,48 @@ class Emitter():
 		"""Branch to specified target if value is zero."""
 
 	@abstractmethod
+	def branch(self, comparison, target):
+		"""Pop value2 and value1 from the stack and branch to the specified target if the specified comparison is true."""
+
 	def br_eq(self, target):
 		"""Pop value2 and value1 from the stack and branch if the equality comparison is true."""
+		self.branch(Comparison.EQ, target)
 
-	@abstractmethod
 	def br_ne(self, target):
 		"""Pop value2 and value1 from the stack and branch if the inequality comparison is true."""
+		self.branch(Comparison.NE, target)
 
-	@abstractmethod
 	def br_lt_s(self, target):
 		"""Pop value2 and value1 from the stack and branch if the signed less than comparison is true."""
+		self.branch(Comparison.LT_S, target)
 
-	@abstractmethod
 	def br_lt_u(self, target):
 		"""Pop value2 and value1 from the stack and branch if the unsigned less than comparison is true."""
+		self.branch(Comparison.LT_U, target)
 
-	@abstractmethod
 	def br_gt_s(self, target):
 		"""Pop value2 and value1 from the stack and branch if the signed greater than comparison is true."""
+		self.branch(Comparison.GT_S, target)
 
-	@abstractmethod
 	def br_gt_u(self, target):
 		"""Pop value2 and value1 from the stack and branch if the unsigned greater than comparison is true."""
+		self.branch(Comparison.GT_U, target)
 
-	@abstractmethod
 	def br_le_s(self, target):
 		"""Pop value2 and value1 from the stack and branch if the signed less than or equal comparison is true."""
+		self.branch(Comparison.LE_S, target)
 
-	@abstractmethod
 	def br_le_u(self, target):
 		"""Pop value2 and value1 from the stack and branch if the unsigned less than or equal comparison is true."""
+		self.branch(Comparison.LE_U, target)
 
-	@abstractmethod
 	def br_ge_s(self, target):
 		"""Pop value2 and value1 from the stack and branch if the signed greater than or equal comparison is true."""
+		self.branch(Comparison.GE_S, target)
 
-	@abstractmethod
 	def br_ge_u(self, target):
 		"""Pop value2 and value1 from the stack and branch if the unsigned greater than or equal comparison is true."""
+		self.branch(Comparison.GE_U, target)
 
 	@abstractmethod
 	def add_sp(self, offset):
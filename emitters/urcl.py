@@ -1,18 +1,55 @@
 from abc import ABCMeta, abstractmethod
-from typing import Callable, Union
-import inspect, re
-
-from emitter import Emitter
-from compiler import parse_value
+from functools import lru_cache
+from typing import Callable, Tuple, Union
+import re, sys
+
+from emitter import Comparison, Emitter
+from parser import parse_value
+
+_comparisonBranches = {
+	Comparison.EQ: "bre",
+	Comparison.NE: "bne",
+	Comparison.LT_S: None,
+	Comparison.LT_U: "brl",
+	Comparison.GT_S: None,
+	Comparison.GT_U: "brg",
+	Comparison.LE_S: None,
+	Comparison.LE_U: "ble",
+	Comparison.GE_S: None,
+	Comparison.GE_U: "bge"
+}
+
+_comparisonSets = {
+	Comparison.EQ: "sete",
+	Comparison.NE: "setne",
+	Comparison.LT_S: None,
+	Comparison.LT_U: "setl",
+	Comparison.GT_S: None,
+	Comparison.GT_U: "setg",
+	Comparison.LE_S: None,
+	Comparison.LE_U: "setle",
+	Comparison.GE_S: None,
+	Comparison.GE_U: "setge"
+}
+
+_readonlyOperations = frozenset({ "bre", "brl", "brg", "brz", "ble", "bge", "bne", "bnz", "jmp", "cal", "psh", "str", "lstr" })
 
 def is_readonly_reg_instruction(inst: "list[str]") -> bool:
-	return inst[0].startswith(".") or inst[0].startswith("//") or re.match(r"(B(R[ELGZ])|([LG]E)|(N[EZ]))|(JMP)|(CAL)|(PSH)|(STR)", inst[0].upper()) != None
+	return inst[0].startswith(".") or inst[0].startswith("//") or inst[0] in _readonlyOperations
+
+# Loads count as side-effect free: memory is assumed not to be memory-mapped I/O, since ports go through IN/OUT.
+_pureOperations = { "mov", "imm", "add", "sub", "mlt", "div", "mod", "and", "or", "xor", "not", "nor", "nand", "xnor", "bsl", "bsr", "lsh", "rsh", "inc", "dec", "neg", "lod", "llod", "sete", "setne", "setl", "setg", "setle", "setge" }
+
+_straightLineOperations = frozenset({ "pop", "psh", "str", "lstr" })
+
+@lru_cache(maxsize=1024)
+def _parse_constant_operand(operand: str) -> Union[int, None]:
+	try: return int(operand)
+	except ValueError: return None
 
 def get_constant_operand(operand: Union[str, int, None]) -> Union[int, None]:
 	if isinstance(operand, int): return operand
-	elif isinstance(operand, str):
-		try: return int(operand)
-		except: pass
+	elif isinstance(operand, str): return _parse_constant_operand(operand)
 	return None
 
 class StackOptimizer(metaclass=ABCMeta):
@@ -43,17 +80,19 @@ class CodeOptimizer(metaclass=ABCMeta):
 class PushStackOptimizer(StackOptimizer):
 	def get_regex(self) -> str: return "PSH"
 	def optimize(self, i: int, insts: "list[list[str]]", get_reg: Callable[[str], Union[str, int, None]], set_reg: Callable[[str, Union[str, int, None]], None], registers: "dict[str, Union[str, int, None]]", stack: "list[Union[str, int, None]]") -> None:
-		try:
-			stack.append(parse_value(insts[i][1]))
+		value = insts[i][1]
+		if isinstance(value, int):
+			stack.append(value)
 			insts[i] = ["nop"]
-		except:
-			value = insts[i][1]
-			if isinstance(value, int):
-				stack.append(value)
-				insts[i] = ["nop"]
-			elif isinstance(value, str):
-				if value.upper().startswith("R") or value.upper() == "SP": stack.append(get_reg(value))
-				else: stack.append(value)
+		elif isinstance(value, str):
+			if value[:1].isdigit() or value.startswith("-"):
+				try:
+					stack.append(parse_value(value))
+					insts[i] = ["nop"]
+					return
+				except: pass
+			if value.upper().startswith("R") or value.upper() == "SP": stack.append(get_reg(value))
+			else: stack.append(value)
 
 class PopStackOptimizer(StackOptimizer):
 	def get_regex(self) -> str: return "POP"
@@ -74,33 +113,32 @@ class GeneralStackOptimizer(StackOptimizer):
 			if isinstance(value, int): insts[i][j] = str(value)
 			elif value == "BP": insts[i][j] = "R3"
 		if len(insts[i]) > 1:
-			if insts[i][0].upper() == "CAL":
+			if insts[i][0] == "cal":
 				registers.clear()
 			elif not registersReadOnly:
 				if insts[i][1] == "SP":
 					def _bad_modification(): raise RuntimeError("This type of stack modification is not allowed.")
 					if len(insts[i]) == 4 and insts[i][2].upper() == "SP" and get_constant_operand(insts[i][3]) != None:
-						if insts[i][0].upper() == "ADD":
-							for _ in range(get_constant_operand(insts[i][3])):
-								if len(stack) > 0: stack.pop()
-								else: raise RuntimeError("Virtual stack underflow.")
-						elif insts[i][0].upper() == "SUB":
-							for _ in range(get_constant_operand(insts[i][3])):
-								stack.append(None)
+						if insts[i][0] == "add":
+							count = get_constant_operand(insts[i][3])
+							if count > len(stack): raise RuntimeError("Virtual stack underflow.")
+							elif count > 0: del stack[len(stack) - count:]
+						elif insts[i][0] == "sub":
+							count = get_constant_operand(insts[i][3])
+							if count > 0: stack.extend([None] * count)
 						else:
 							_bad_modification()
 					elif len(insts[i]) == 4 and insts[i][2].upper() == "R3" and get_constant_operand(insts[i][3]) != None:
-						if insts[i][0].upper() == "SUB":
+						if insts[i][0] == "sub":
 							newStackLength = get_constant_operand(insts[i][3]) + 1
-							while len(stack) > newStackLength:
-								if len(stack) > 0: stack.pop()
-								else: raise RuntimeError("Virtual stack underflow.")
+							if newStackLength < 0: raise RuntimeError("Virtual stack underflow.")
+							del stack[newStackLength:]
 						else:
 							_bad_modification()
 					else:
 						_bad_modification()
 				set_reg(insts[i][1], None)
-		elif insts[i][0].upper() == "RET":
+		elif insts[i][0] == "ret":
 			registers.clear()
 			registers["SP"] = "BP"
 
@@ -113,7 +151,7 @@ class PushFollowedByPopOptimizer(PairOptimizer):
 	def get_regex_current(self) -> str: return "PSH"
 	def get_regex_next(self) -> str: return "POP"
 	def optimize(self, current: int, next: int, insts: "list[list[str]]") -> bool:
-		if insts[next][1] == insts[current][1]: insts.pop(next)
+		if insts[next][1] == insts[current][1] or insts[next][1].upper() == "R0": insts.pop(next)
 		else: insts[next] = ["mov", insts[next][1], insts[current][1]]
 		insts.pop(current)
 		return True
@@ -126,11 +164,15 @@ class RepeatedAddAndSubtractOptimizer(PairOptimizer):
 			if insts[current][1] == insts[next][2] and insts[current][1] == insts[next][1]:
 				a = get_constant_operand(insts[current][3])
 				b = get_constant_operand(insts[next][3])
-				if insts[current][0].upper() == "SUB": a = -a
-				if insts[next][0].upper() == "SUB": b = -b
+				if insts[current][0] == "sub": a = -a
+				if insts[next][0] == "sub": b = -b
 				value = a + b
 				if value < 0: insts[current] = ["sub", insts[next][1], insts[current][2], str(-value)]
 				elif value > 0: insts[current] = ["add", insts[next][1], insts[current][2], str(value)]
+				elif insts[next][1] == insts[current][2] or insts[next][1].upper() == "R0":
+					insts.pop(next)
+					insts.pop(current)
+					return True
 				else: insts[current] = ["mov", insts[next][1], insts[current][2]]
 				insts.pop(next)
 				return True
@@ -161,7 +203,7 @@ class JumpNextOptimizer(PairOptimizer):
 class VoidMoveOptimizer(MonoOptimizer):
 	def get_regex(self) -> str: return "MOV"
 	def optimize(self, i: int, insts: "list[list[str]]") -> bool:
-		if insts[i][1] == insts[i][2] or insts[i][1] == "R0":
+		if insts[i][1] == insts[i][2] or insts[i][1].upper() == "R0":
 			insts.pop(i)
 			return True
 		return False
@@ -172,41 +214,76 @@ class CommentOptimizer(MonoOptimizer):
 		insts.pop(i)
 		return True
 
+class DeadResultOptimizer(CodeOptimizer):
+	def optimize(self, insts: "list[list[str]]") -> bool:
+		overwritten = set()
+		live = []
+		for inst in reversed(insts):
+			if inst[0].startswith("//"):
+				live.append(inst)
+				continue
+			elif len(inst) < 2 or not (inst[0] in _pureOperations or inst[0] in _straightLineOperations):
+				overwritten.clear()
+				live.append(inst)
+				continue
+			writes = inst[0] in _pureOperations or inst[0] == "pop"
+			if inst[0] in _pureOperations and inst[1].upper() not in ("R0", "SP") and inst[1].upper() in overwritten: continue
+			live.append(inst)
+			if writes: overwritten.add(inst[1].upper())
+			for operand in inst[2 if writes else 1:]: overwritten.discard(operand.upper())
+		if len(live) == len(insts): return False
+		live.reverse()
+		insts[:] = live
+		return True
+
 class LabelOptimizer(CodeOptimizer):
 	def optimize(self, insts: "list[list[str]]") -> bool:
-		rerun = False
-		labels = []
-		for i in range(len(insts)):
-			if insts[i][0].startswith(".__"): labels.append([insts[i][0], i, 0])
+		referenced = set()
 		for inst in insts:
-			if len(inst) > 1:
-				for operand in inst[1:]:
-					if operand.startswith(".__"):
-						for i in range(len(labels)):
-							if labels[i][0] == operand: labels[i][2] += 1
-		offset = 0
-		for label in labels:
-			if label[2] == 0:
-				rerun = True
-				insts.pop(label[1] - offset)
-				offset += 1
-		return rerun
+			for operand in inst[1:]:
+				if operand.startswith(".__"): referenced.add(operand)
+		count = len(insts)
+		insts[:] = [inst for inst in insts if not inst[0].startswith(".__") or inst[0] in referenced]
+		return len(insts) != count
 
 class URCLEmitter(Emitter):
-	def __init__(self, showIL=False, optimize=True, optimizers=[PushStackOptimizer(), PopStackOptimizer(), GeneralStackOptimizer(), StackVerificationOptimizer(), PushFollowedByPopOptimizer(), RepeatedAddAndSubtractOptimizer(), OverwrittenResultOptimizer(), JumpNextOptimizer(), VoidMoveOptimizer(), LabelOptimizer()]):
+	def __init__(self, showIL=False, optimize=True, branchlessCompare=False, optimizers=[PushStackOptimizer(), PopStackOptimizer(), GeneralStackOptimizer(), StackVerificationOptimizer(), PushFollowedByPopOptimizer(), RepeatedAddAndSubtractOptimizer(), OverwrittenResultOptimizer(), JumpNextOptimizer(), VoidMoveOptimizer(), LabelOptimizer(), DeadResultOptimizer()]):
 		super().__init__()
 		self._current = 0
 		self._internal = 0
 		self._insts = []
+		self._spOffset = 0
 		self._showIL = showIL
 		self._optimize = optimize
+		self._branchlessCompare = branchlessCompare
 		self._optimizers = optimizers
+		self._stripComments = optimize and any(isinstance(optimizer, CommentOptimizer) for optimizer in optimizers)
+		self._stackOptimizers = [(optimizer, re.compile(f"^{optimizer.get_regex()}$", re.IGNORECASE)) for optimizer in optimizers if isinstance(optimizer, StackOptimizer)]
+		self._peepholeOptimizers = []
+		for optimizer in optimizers:
+			if isinstance(optimizer, PairOptimizer): self._peepholeOptimizers.append((optimizer, re.compile(f"^{optimizer.get_regex_current()}$", re.IGNORECASE), re.compile(f"^{optimizer.get_regex_next()}$", re.IGNORECASE)))
+			elif isinstance(optimizer, MonoOptimizer): self._peepholeOptimizers.append((optimizer, re.compile(f"^{optimizer.get_regex()}$", re.IGNORECASE), None))
+		self._codeOptimizers = [optimizer for optimizer in optimizers if isinstance(optimizer, CodeOptimizer)]
+		self._stackDispatch: "dict[str, Union[StackOptimizer, None]]" = {}
+		self._peepholeDispatch: "dict[str, list[Tuple[Union[PairOptimizer, MonoOptimizer], Union[re.Pattern, None]]]]" = {}
 	
 	def _emit(self, *args):
-		result = []
-		for arg in args:
-			if arg != None: result.append(arg)
-		self._insts.append(result)
+		inst = list(args)
+		if self._optimize and inst[0] == "pop" and self._forward_spill(inst[1]): return
+		self._insts.append(inst)
+
+	def _forward_spill(self, reg):
+		if reg.upper() in ("SP", "R3"): return False
+		marker = self._target(self._current)
+		i = len(self._insts) - 1
+		while i >= 0 and (self._insts[i][0].startswith("//") or self._insts[i][0] == marker): i -= 1
+		if i < 1 or self._insts[i][0] != "psh": return False
+		source = self._insts[i][1]
+		previous = self._insts[i - 1]
+		if not (previous[0] in _pureOperations and len(previous) > 1 and previous[1] == source and source.upper().startswith("R")): return False
+		self._insts.pop(i)
+		if source != reg: self._insts.append(["mov", reg, source])
+		return True
 
 	def _target(self, target, internal=False):
 		if isinstance(target, int) and internal: return ".___urcl___internal___" + str(target)
@@ -220,16 +297,42 @@ class URCLEmitter(Emitter):
 	def _lmark(self, label):
 		self._emit(self._target(label, True))
 
+	def _flush_sp(self):
+		if self._spOffset > 0: self._emit("sub", "SP", "SP", str(self._spOffset))
+		elif self._spOffset < 0: self._emit("add", "SP", "SP", str(-self._spOffset))
+		self._spOffset = 0
+
+	def _get_stack_optimizer(self, operation):
+		if operation not in self._stackDispatch:
+			self._stackDispatch[operation] = None
+			for optimizer, pattern in self._stackOptimizers:
+				if pattern.match(operation) != None:
+					self._stackDispatch[operation] = optimizer
+					break
+		return self._stackDispatch[operation]
+
+	def _get_peephole_optimizers(self, operation):
+		if operation not in self._peepholeDispatch:
+			self._peepholeDispatch[operation] = [(optimizer, nextPattern) for optimizer, pattern, nextPattern in self._peepholeOptimizers if pattern.match(operation) != None]
+		return self._peepholeDispatch[operation]
+
 	def _next(self, index, allowLabels=False):
 		for i in range(index + 1, len(self._insts)):
-			if not ((self._insts[i][0].startswith(".") and not allowLabels) or self._insts[i][0].startswith("//") or self._insts[i][0].upper() == "NOP"):
+			if not ((self._insts[i][0].startswith(".") and not allowLabels) or self._insts[i][0].startswith("//")):
 				return i
 		return None
 
+	def _previous(self, index):
+		for i in range(index - 1, -1, -1):
+			if not (self._insts[i][0].startswith(".") or self._insts[i][0].startswith("//")):
+				return i
+		return 0
+
 	def get_current_offset(self):
 		return self._current
 
 	def commit(self, stream):
+		self._flush_sp()
 		if self._optimize:
 			stack = []
 			registers = { "SP": "BP" }
@@ -242,49 +345,48 @@ class URCLEmitter(Emitter):
 				name = name.upper()
 				if name != "R0": registers[name] = value
 			
+			live = []
 			for i in range(len(self._insts)):
-				for optimizer in self._optimizers:
-					if isinstance(optimizer, StackOptimizer) and re.match(f"^{optimizer.get_regex()}$", self._insts[i][0].upper()) != None:
-						optimizer.optimize(i, self._insts, _get_reg, _set_reg, registers, stack)
-						break
+				optimizer = self._get_stack_optimizer(self._insts[i][0])
+				if optimizer != None: optimizer.optimize(i, self._insts, _get_reg, _set_reg, registers, stack)
+				if self._insts[i][0] != "nop": live.append(self._insts[i])
+			self._insts = live
 
 			i = 0
 			rerun = False
 			while i < len(self._insts):
 				rerun = False
-				for optimizer in self._optimizers:
-					if isinstance(optimizer, PairOptimizer):
-						current = i
+				for optimizer, nextPattern in self._get_peephole_optimizers(self._insts[i][0]):
+					if nextPattern == None:
+						if optimizer.optimize(i, self._insts):
+							rerun = True
+							break
+					else:
 						next = self._next(i, optimizer.get_allow_labels_next())
-						if next != None and re.match(f"^{optimizer.get_regex_current()}$", self._insts[current][0].upper()) != None and re.match(f"^{optimizer.get_regex_next()}$", self._insts[next][0].upper()) != None:
-							if optimizer.optimize(current, next, self._insts):
+						if next != None and nextPattern.match(self._insts[next][0]) != None:
+							if optimizer.optimize(i, next, self._insts):
 								rerun = True
 								break
-					elif isinstance(optimizer, MonoOptimizer):
-						if re.match(f"^{optimizer.get_regex()}$", self._insts[i][0].upper()) != None:
-							if optimizer.optimize(i, self._insts):
-								rerun = True
-								break
-				if rerun: i = 0
+				if rerun: i = self._previous(i)
 				else: i += 1
 			
 			rerun = True
 			while rerun:
 				rerun = False
-				for optimizer in self._optimizers:
-					if isinstance(optimizer, CodeOptimizer):
-						rerun |= optimizer.optimize(self._insts)
+				for optimizer in self._codeOptimizers:
+					rerun |= optimizer.optimize(self._insts)
 
-		for inst in self._insts:
-			if inst[0].upper() != "NOP": stream.write(" ".join(inst) + "\n")
+		stream.write("".join([" ".join(inst) + "\n" for inst in self._insts if inst[0] != "nop"]))
 
 	def comment(self, text):
+		if self._stripComments: return
 		parts = text.split(" ")
 		parts[0] = f"//{parts[0]}"
 		self._emit(*parts)
 
-	def begin_instruction(self):
-		if self._showIL: self.comment(inspect.stack()[1].function)
+	def begin_instruction(self, name=None):
+		self._flush_sp()
+		if self._showIL: self.comment(name if name != None else sys._getframe(1).f_code.co_name)
 		self._emit(self._target(self._current))
 	
 	def end_instruction(self):
@@ -292,6 +394,7 @@ class URCLEmitter(Emitter):
 
 	def emit_raw(self, operation, operands):
 		self.begin_instruction()
+		if not (operation.startswith(".") or operation.startswith("//")): operation = operation.lower()
 		self._emit(*([operation] + operands))
 		self.end_instruction()
 
@@ -300,6 +403,13 @@ class URCLEmitter(Emitter):
 		self._emit("psh", str(immediate))
 		self.end_instruction()
 
+	def push_fill(self, immediate, count):
+		if count < 1: return
+		self.begin_instruction()
+		value = str(immediate)
+		self._insts.extend([["psh", value] for _ in range(count)])
+		self.end_instruction()
+
 	def pop(self):
 		self.begin_instruction()
 		self._emit("pop", "R0")
@@ -401,95 +511,23 @@ class URCLEmitter(Emitter):
 		self._emit("psh", "R1")
 		self.end_instruction()
 
-	def cmp_eq(self):
-		self.begin_instruction()
-		end = self._lcreate()
-		true = self._lcreate()
-		self._emit("pop", "R2")
-		self._emit("pop", "R1")
-		self._emit("bre", self._target(true, True), "R1", "R2")
-		self._emit("psh", "0")
-		self._emit("jmp", self._target(end, True))
-		self._lmark(true)
-		self._emit("psh", "1")
-		self._lmark(end)
-		self.end_instruction()
-
-	def cmp_ne(self):
-		self.begin_instruction()
-		end = self._lcreate()
-		true = self._lcreate()
-		self._emit("pop", "R2")
-		self._emit("pop", "R1")
-		self._emit("bne", self._target(true, True), "R1", "R2")
-		self._emit("psh", "0")
-		self._emit("jmp", self._target(end, True))
-		self._lmark(true)
-		self._emit("psh", "1")
-		self._lmark(end)
-		self.end_instruction()
-
-	def cmp_lt_s(self):
-		raise NotImplementedError()
-
-	def cmp_lt_u(self):
-		self.begin_instruction()
-		end = self._lcreate()
-		true = self._lcreate()
-		self._emit("pop", "R2")
-		self._emit("pop", "R1")
-		self._emit("brl", self._target(true, True), "R1", "R2")
-		self._emit("psh", "0")
-		self._emit("jmp", self._target(end, True))
-		self._lmark(true)
-		self._emit("psh", "1")
-		self._lmark(end)
-		self.end_instruction()
-
-	def cmp_gt_s(self):
-		raise NotImplementedError()
-
-	def cmp_gt_u(self):
-		self.begin_instruction()
-		end = self._lcreate()
-		true = self._lcreate()
-		self._emit("pop", "R2")
-		self._emit("pop", "R1")
-		self._emit("brg", self._target(true, True), "R1", "R2")
-		self._emit("psh", "0")
-		self._emit("jmp", self._target(end, True))
-		self._lmark(true)
-		self._emit("psh", "1")
-		self._lmark(end)
-		self.end_instruction()
-
-	def cmp_le_s(self):
-		raise NotImplementedError()
-
-	def cmp_le_u(self):
-		self.begin_instruction()
-		end = self._lcreate()
-		true = self._lcreate()
-		self._emit("pop", "R2")
-		self._emit("pop", "R1")
-		self._emit("ble", self._target(true, True), "R1", "R2")
-		self._emit("psh", "0")
-		self._emit("jmp", self._target(end, True))
-		self._lmark(true)
-		self._emit("psh", "1")
-		self._lmark(end)
-		self.end_instruction()
-
-	def cmp_ge_s(self):
-		raise NotImplementedError()
-
-	def cmp_ge_u(self):
-		self.begin_instruction()
+	def compare(self, comparison):
+		operation = _comparisonBranches[comparison]
+		if operation == None: raise NotImplementedError()
+		self.begin_instruction(f"cmp_{comparison.name.lower()}")
+		if self._branchlessCompare:
+			self._emit("pop", "R2")
+			self._emit("pop", "R1")
+			self._emit(_comparisonSets[comparison], "R1", "R1", "R2")
+			self._emit("and", "R1", "R1", "1")
+			self._emit("psh", "R1")
+			self.end_instruction()
+			return
 		end = self._lcreate()
 		true = self._lcreate()
 		self._emit("pop", "R2")
 		self._emit("pop", "R1")
-		self._emit("bge", self._target(true, True), "R1", "R2")
+		self._emit(operation, self._target(true, True), "R1", "R2")
 		self._emit("psh", "0")
 		self._emit("jmp", self._target(end, True))
 		self._lmark(true)
@@ -524,68 +562,23 @@ class URCLEmitter(Emitter):
 		self._emit("bnz", self._target(target), "R1")
 		self.end_instruction()
 
-	def br_eq(self, target):
-		self.begin_instruction()
+	def branch(self, comparison, target):
+		operation = _comparisonBranches[comparison]
+		if operation == None: raise NotImplementedError()
+		self.begin_instruction(f"br_{comparison.name.lower()}")
 		self._emit("pop", "R2")
 		self._emit("pop", "R1")
-		self._emit("bre", self._target(target), "R1", "R2")
-		self.end_instruction()
-
-	def br_ne(self, target):
-		self.begin_instruction()
-		self._emit("pop", "R2")
-		self._emit("pop", "R1")
-		self._emit("bne", self._target(target), "R1", "R2")
-		self.end_instruction()
-
-	def br_lt_s(self, target):
-		raise NotImplementedError()
-
-	def br_lt_u(self, target):
-		self.begin_instruction()
-		self._emit("pop", "R2")
-		self._emit("pop", "R1")
-		self._emit("brl", self._target(target), "R1", "R2")
-		self.end_instruction()
-
-	def br_gt_s(self, target):
-		raise NotImplementedError()
-
-	def br_gt_u(self, target):
-		self.begin_instruction()
-		self._emit("pop", "R2")
-		self._emit("pop", "R1")
-		self._emit("brg", self._target(target), "R1", "R2")
-		self.end_instruction()
-
-	def br_le_s(self, target):
-		raise NotImplementedError()
-
-	def br_le_u(self, target):
-		self.begin_instruction()
-		self._emit("pop", "R2")
-		self._emit("pop", "R1")
-		self._emit("ble", self._target(target), "R1", "R2")
-		self.end_instruction()
-
-	def br_ge_s(self, target):
-		raise NotImplementedError()
-
-	def br_ge_u(self, target):
-		self.begin_instruction()
-		self._emit("pop", "R2")
-		self._emit("pop", "R1")
-		self._emit("bge", self._target(target), "R1", "R2")
+		self._emit(operation, self._target(target), "R1", "R2")
 		self.end_instruction()
 
 	def add_sp(self, offset):
 		self.begin_instruction()
-		self._emit("sub", "SP", "SP", str(offset))
+		self._spOffset += offset
 		self.end_instruction()
 
 	def rem_sp(self, offset):
 		self.begin_instruction()
-		self._emit("add", "SP", "SP", str(offset))
+		self._spOffset -= offset
 		self.end_instruction()
 
 	def ld_sp(self):
@@ -616,21 +609,22 @@ class URCLEmitter(Emitter):
 				self._emit("lod", "R1", "R1")
 				self._emit("psh", "R1")
 			else:
-				self._emit("add", "R1", "R1", str(size - 1))
-				for i in range(size):
-					if i != 0: self._emit("sub", "R1", "R1", "1")
-					self._emit("lod", "R2", "R1")
-					self._emit("psh", "R2")
+				emit = self._emit
+				for i in range(size - 1, -1, -1):
+					if i != 0: emit("llod", "R2", "R1", str(i))
+					else: emit("lod", "R2", "R1")
+					emit("psh", "R2")
 		self.end_instruction()
 
 	def st_ptr(self, size):
 		self.begin_instruction()
 		if size > 0:
-			self._emit("pop", "R1")
+			emit = self._emit
+			emit("pop", "R1")
 			for i in range(size):
-				if i != 0: self._emit("add", "R1", "R1", "1")
-				self._emit("pop", "R2")
-				self._emit("str", "R1", "R2")
+				emit("pop", "R2")
+				if i != 0: emit("lstr", "R1", str(i), "R2")
+				else: emit("str", "R1", "R2")
 		self.end_instruction()
 
 	def ld_global(self, index):
@@ -644,4 +638,5 @@ class URCLEmitter(Emitter):
 		self.end_instruction()
 
 	def _emit_label(self, label):
+		self._flush_sp()
 		if len(label.get_name()) > 0: self._emit(self._target(label.get_name()))
\ No newline at end of file
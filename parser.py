@@ -0,0 +1,326 @@
+from typing import Tuple, Union
+import os, re
+
+from compiler import _operators, AssemblyInstructionStatement, AssemblyLoadStatement, AssemblyStoreStatement, AssignmentStatement, BinaryOperandExpression, Callable, CallExpression, CallStatement, CastExpression, ComplexType, ConstantExpression, Expression, Field, Function, Local, LocalStatement, Module, Operator, ReturnStatement, Statement, SubRoutine, Type, UnaryOperandExpression, VariableExpression, VoidExpression
+
+_castOperator = Operator(1, True, "CAST", 2)
+
+_statements = {}
+_blocks = {}
+_blockStart = re.compile(r"(?!)")
+
+_VALUE_BASES = { "0X": 16, "0O": 8, "0B": 2 }
+_RE_LOCAL = re.compile(r"^[Dd][Ii][Mm]\s+(\w[\w\d]*)\s+[Aa][Ss]\s+(\w[\w\d]*)\s*(=\s*(.+))?$")
+_RE_FIELD = re.compile(r"^DIM\s+(\w[\w\d]*)\s+AS\s+(\w[\w\d]*)$", re.IGNORECASE)
+_RE_STRUCT_HEADER = re.compile(r"^STRUCTURE\s+(\w[\w\d]*)$", re.IGNORECASE)
+_RE_STRUCT_FOOTER = re.compile(r"^END\s+STRUCTURE$", re.IGNORECASE)
+_RE_ARG = re.compile(r"\s*(?:(BYREF)\s+)?(\w[\w\d]*)\s+AS\s+(\w[\w\d\*]*)\s*(?:,|$)", re.IGNORECASE)
+_RE_SUB_HEADER = re.compile(r"^SUB\s+(\w[\w\d]*)\s*\((\s*(?:(?:\s*(?:BYREF\s+)?\w[\w\d]*\s+AS\s+\w[\w\d\*]*\s*,)*\s*(?:BYREF\s+)?\w[\w\d]*\s+AS\s+\w[\w\d\*]*\s*)?)\)$", re.IGNORECASE)
+_RE_SUB_FOOTER = re.compile(r"^END\s+SUB$", re.IGNORECASE)
+_RE_FUNCTION_HEADER = re.compile(r"^FUNCTION\s+(\w[\w\d]*)\s*\((\s*(?:(?:\s*(?:BYREF\s+)?\w[\w\d]*\s+AS\s+\w[\w\d\*]*\s*,)*\s*(?:BYREF\s+)?\w[\w\d]*\s+AS\s+\w[\w\d\*]*\s*)?)\)\s+AS\s+(\w[\w\d\*]*)$", re.IGNORECASE)
+_RE_FUNCTION_FOOTER = re.compile(r"^END\s+FUNCTION$", re.IGNORECASE)
+_RE_BLOCK_NAME = re.compile(r"^(\w+)")
+_RE_KEYWORD = re.compile(r"^\s*(\w+)(?:\s|$)")
+_RE_EXPRESSION_TOKEN = re.compile(r"(?P<call>\w[\w\d\.\*]*\()|(?P<name>\w[\w\d\.\*]*)|(?P<number>\-?\d[\w\d\.]*)|(?P<space>\s+)|(?P<symbol>[\+\-\*\/\.]+|AS)|(?P<open>\()|(?P<close>\))", re.IGNORECASE)
+_RE_ASM = re.compile(r"^\s*ASM\s+(\w+)\s+([\w\d\.]+)\s*(.*?)\s*$", re.IGNORECASE)
+_RE_RETURN = re.compile(r"^\s*RETURN(?:\s+(.*))?\s*$", re.IGNORECASE)
+_RE_ASSIGN = re.compile(r"^\s*(\w[\w\d\.]*)\s*=\s*(.*)")
+_RE_CALL = re.compile(r"^\s*(\w[\w\d\.]*)\s*\(")
+_RE_EXTENSION = re.compile(r"\.[^\.]+$")
+_RE_MODULE_NAME = re.compile(r"\w[\w\d]*")
+
+def parse_value(text: str) -> int:
+	negate = text.startswith("-")
+	if negate: text = text[1:]
+	base = _VALUE_BASES.get(text[:2].upper())
+	if base != None: digits = text[2:]
+	elif len(text) > 1 and text.startswith("0"): raise Exception("Invalid value.")
+	else: digits, base = text, 10
+	if not (digits.isascii() and digits.isalnum()): raise Exception("Invalid value.")
+	try: result = int(digits, base)
+	except ValueError: raise Exception("Invalid value.")
+	return -result if negate else result
+
+def parse_local(line: str) -> Local:
+	match = _RE_LOCAL.match(line)
+	if match == None: raise Exception("Invalid local declaration. Example: Dim value As Integer = 10")
+	name = match.group(1)
+	type = match.group(2)
+	initial = match.group(4)
+	if initial != None: initial = parse_value(initial)
+	return Local(type, name, initial)
+
+def parse_local_statement(line: str) -> LocalStatement:
+	return LocalStatement(parse_local(line))
+
+def parse_field(line: str, index: int) -> Field:
+	match = _RE_FIELD.match(line)
+	if match == None: raise Exception("Invalid field declaration. Example: Dim value As Integer")
+	name = match.group(1)
+	type = match.group(2)
+	return Field(None, type, name, index)
+
+def parse_struct(lines: "list[str]") -> ComplexType:
+	if len(lines) < 2: raise Exception("Invalid structure.")
+	header = _RE_STRUCT_HEADER.match(lines[0])
+	footer = _RE_STRUCT_FOOTER.match(lines[-1])
+	if header == None: raise Exception("Invalid structure header. Example: Structure MyData")
+	if footer == None: raise Exception("Invalid structure footer. Example: End Structure")
+	fields = []
+	for line in lines[1:-1]:
+		if len(line) > 0: fields.append(parse_field(line, len(fields)))
+	return ComplexType(header.group(1), fields)
+
+def parse_arguments(argList: str) -> "list[Tuple[Union[Type, str], str, bool]]":
+	result = []
+	if len(argList) == 0 or argList.isspace(): return result
+	position = 0
+	for match in _RE_ARG.finditer(argList):
+		if match.start() != position: break
+		result.append((match.group(3), match.group(2), str(match.group(1)).upper() == "BYREF"))
+		position = match.end()
+	if position != len(argList) or argList.endswith(","): raise Exception("Invalid argument. Example: value As Integer")
+	return result
+
+def parse_subroutine(lines: "list[Union[str, list]]") -> SubRoutine:
+	if len(lines) < 2: raise Exception("Invalid subroutine.")
+	header = _RE_SUB_HEADER.match(lines[0])
+	footer = _RE_SUB_FOOTER.match(lines[-1])
+	if header == None: raise Exception("Invalid subroutine header. Example: Sub MyCode(a As Integer, b As Integer)")
+	if footer == None: raise Exception("Invalid subroutine footer. Example: End Sub")
+	statements = []
+	for line in lines[1:-1]:
+		statement = parse_statement(line)
+		if statement != None: statements.append(statement)
+	return SubRoutine(header.group(1), parse_arguments(header.group(2)), statements)
+
+def parse_function(lines: "list[Union[str, list]]") -> Function:
+	if len(lines) < 2: raise Exception("Invalid function.")
+	header = _RE_FUNCTION_HEADER.match(lines[0])
+	footer = _RE_FUNCTION_FOOTER.match(lines[-1])
+	if header == None: raise Exception("Invalid function header. Example: Function MyCode(a As Integer, b As Integer) As Integer")
+	if footer == None: raise Exception("Invalid function footer. Example: End Function")
+	statements = []
+	for line in lines[1:-1]:
+		statement = parse_statement(line)
+		if statement != None: statements.append(statement)
+	return Function(header.group(1), parse_arguments(header.group(2)), header.group(3), statements)
+
+def collect_blocks(lines: "list[str]", isRootBlock=False, start: int = 0) -> "Tuple[list[Union[str, list]], int]":
+	result = []
+	i = start
+	count = len(lines)
+	blockName = ""
+	footerPattern = None
+	while i < count:
+		innerBlock = False
+		if i == start and not isRootBlock:
+			header = _RE_BLOCK_NAME.match(lines[start])
+			if header == None: raise Exception("Invalid block header.")
+			blockName = header.group(1).upper()
+			if blockName not in _blocks: raise Exception("Invalid block header.")
+			footerPattern = _blocks[blockName][1]
+		elif _blockStart.match(lines[i]) != None:
+			block, i = collect_blocks(lines, False, i)
+			result.append(block)
+			innerBlock = True
+		if not innerBlock:
+			line = lines[i]
+			result.append(line)
+			i += 1
+			if not isRootBlock:
+				if footerPattern.match(line) != None: return result, i
+	if isRootBlock:
+		return result, i
+	else:
+		raise Exception("\"" + blockName + "\" block is missing \"END " + blockName + "\"")
+
+def get_operator(name: str) -> "Union[Operator, None]":
+	name = name.upper()
+	if name == "AS": return _castOperator
+	else: return _operators.get(name)
+
+def parse_postfix(line: str) -> "list[Tuple[str, str]]":
+	queue = []
+	stack = []
+
+	for match in _RE_EXPRESSION_TOKEN.finditer(line):
+		kind = match.lastgroup
+		token = match.group()
+		if kind == "space": continue
+		operator = get_operator(token) if kind == "name" or kind == "symbol" else None
+		if operator != None:
+			while (len(stack) > 0) and (stack[-1][2] != None) and ((stack[-1][2].precedence > operator.precedence) or (operator.leftAssociative and stack[-1][2].precedence == operator.precedence)):
+				queue.append(stack.pop()[:2])
+			stack.append(("cast" if operator is _castOperator else "operator", token.upper(), operator))
+		elif kind == "call":
+			stack.append((kind, token, None))
+			stack.append(("open", "(", None))
+			queue.append(("arguments", ")"))
+		elif kind == "open":
+			stack.append((kind, token, None))
+		elif kind == "close":
+			while (len(stack) > 0) and (stack[-1][0] != "open"): queue.append(stack.pop()[:2])
+			if len(stack) == 0: raise Exception("Missing \"(\".")
+			stack.pop()
+			if len(stack) > 0 and stack[-1][0] == "call": queue.append(stack.pop()[:2])
+		elif kind == "number" or token[0].isdigit():
+			queue.append(("number", token))
+		else:
+			queue.append(("name", token))
+
+	while len(stack) > 0:
+		item = stack.pop()
+		if item[0] == "open": raise Exception("Missing \")\".")
+		queue.append(item[:2])
+	return queue
+
+def _build_arguments(token: str, stack: list) -> None: stack.append(token)
+def _build_number(token: str, stack: list) -> None: stack.append(ConstantExpression(parse_value(token), "Integer"))
+def _build_name(token: str, stack: list) -> None: stack.append(VariableExpression(token))
+
+def _build_cast(token: str, stack: list) -> None:
+	if len(stack) < 2: raise Exception("Expected 2 operands for \"" + token + "\" operator.")
+	if not isinstance(stack[-1], VariableExpression): raise Exception("Expected type name for second operand of \"AS\".")
+	stack[-2] = CastExpression(stack[-1].GetName(), stack[-2])
+	stack.pop()
+
+def _build_operator(token: str, stack: list) -> None:
+	argCount = _operators[token].arity
+	if argCount == 1:
+		if len(stack) < 1: raise Exception("Expected 1 operand for \"" + token + "\" operator.")
+		stack[-1] = UnaryOperandExpression(token, stack[-1])
+	elif argCount == 2:
+		if len(stack) < 2: raise Exception("Expected 2 operands for \"" + token + "\" operator.")
+		stack[-2] = BinaryOperandExpression(token, stack[-2], stack[-1])
+		stack.pop()
+
+def _build_call(token: str, stack: list) -> None:
+	args = []
+	if len(stack) == 0: raise Exception("Invalid call expression.")
+	while stack[-1] != ")":
+		args.append(stack.pop())
+		if len(stack) == 0: raise Exception("Missing argument list terminator.")
+	stack.pop()
+	args.reverse()
+	stack.append(CallExpression(token[:-1], args))
+
+_expressionBuilders = {
+	"arguments": _build_arguments,
+	"number": _build_number,
+	"name": _build_name,
+	"cast": _build_cast,
+	"operator": _build_operator,
+	"call": _build_call
+}
+
+def parse_expression(line: str) -> Expression:
+	stack = []
+	for kind, token in parse_postfix(line): _expressionBuilders[kind](token, stack)
+	if len(stack) != 1: raise Exception("Expressions must produce one value.")
+	return stack[0]
+
+def parse_asm_statement(line: str) -> Statement:
+	match = _RE_ASM.match(line)
+	if match == None: raise Exception("Invalid assembly statement.")
+	if match.group(1).upper() == "LOAD":
+		if match.group(3) == "": return AssemblyLoadStatement(match.group(2))
+		else: raise Exception("Assembly load statement only accepts 1 parameter.")
+	elif match.group(1).upper() == "SAVE":
+		if match.group(3) == "": return AssemblyStoreStatement(match.group(2))
+		else: raise Exception("Assembly save statement only accepts 1 parameter.")
+	elif match.group(1).upper() == "EXEC":
+		return AssemblyInstructionStatement(match.group(2), match.group(3).split())
+	else:
+		raise Exception("Unrecognized assembly statement type.")
+
+def parse_return_statement(line: str) -> ReturnStatement:
+	match = _RE_RETURN.match(line)
+	if match == None: raise Exception("Invalid return statement.")
+	expression = match.group(1)
+	if expression == None or len(expression.strip()) == 0: return ReturnStatement(VoidExpression())
+	else: return ReturnStatement(parse_expression(expression))
+
+def parse_assign_statement(line: str) -> AssignmentStatement:
+	match = _RE_ASSIGN.match(line)
+	if match == None: raise Exception("Invalid assignment statement.")
+	target = match.group(1)
+	expression = match.group(2)
+	return AssignmentStatement(target, parse_expression(expression))
+
+def parse_call_statement(line: str) -> CallStatement:
+	expression = parse_expression(line)
+	if isinstance(expression, CallExpression): return CallStatement(expression)
+	else: raise Exception("Inline statement must be call or assignment.")
+
+def parse_inline_statement(line: str) -> Statement:
+	match = _RE_ASSIGN.match(line)
+	if match != None: return parse_assign_statement(line)
+	match = _RE_CALL.match(line)
+	if match != None: return parse_call_statement(line)
+	raise Exception("Invalid inline statement.")
+
+def parse_statement(statement: Union[str, list]) -> Union[Statement, None]:
+	if isinstance(statement, str):
+		if len(statement) > 0:
+			keyword = _RE_KEYWORD.match(statement)
+			if keyword != None:
+				key = keyword.group(1).upper()
+				if key in _statements: return _statements[key](statement)
+			return parse_inline_statement(statement)
+		else:
+			return None
+	else:
+		keyword = _RE_KEYWORD.match(statement[0])
+		if keyword != None:
+			key = keyword.group(1).upper()
+			if key in _blocks and _blocks[key][1].match(statement[-1]) != None: return _blocks[key][0](statement)
+		raise Exception("Unknown block type or missing end statement.")
+
+def parse_module(name: str, lines: "list[str]") -> Module:
+	types = []
+	code = []
+	for node in collect_blocks([line.strip() for line in lines], True)[0]:
+		info = parse_statement(node)
+		if isinstance(info, Type): types.append(info)
+		elif isinstance(info, Callable): code.append(info)
+		elif info == None: pass
+		else: raise Exception(type(info).__name__ + " is not valid at the root level.")
+
+	return Module(name, types, code)
+
+def parse_file(file: str) -> Module:
+	name = os.path.basename(file)
+
+	if "." in name: name = _RE_EXTENSION.sub("", name)
+
+	nameMatch = _RE_MODULE_NAME.match(name)
+	if nameMatch == None: raise Exception("Invalid module name \"" + name + "\".")
+
+	stream = open(file, "r")
+	lines = stream.read().splitlines()
+	stream.close()
+
+	return parse_module(name, lines)
+
+def register_statement(key: str, handler) -> None:
+	_statements[key.upper()] = handler
+
+def register_block(key: str, handler) -> None:
+	global _blockStart
+	key = key.upper()
+	_blocks[key] = (handler, re.compile(r"^\s*END\s+" + re.escape(key) + r"\s*$", re.IGNORECASE))
+	_blockStart = re.compile(r"^\s*(?:" + "|".join(re.escape(key) for key in _blocks) + r")(?:\s|$)", re.IGNORECASE)
+
+register_statement("CALL", None)
+register_statement("RETURN", parse_return_statement)
+register_statement("DIM", parse_local_statement)
+register_statement("ASM", parse_asm_statement)
+
+register_block("SUB", parse_subroutine)
+register_block("FUNCTION", parse_function)
+register_block("STRUCTURE", parse_struct)
+register_block("IF", None)
+register_block("WHILE", None)
+register_block("FOR", None)
+register_block("TRY", None)
\ No newline at end of file
@@ -0,0 +1,19 @@
+from compiler import Function, Local, LocalStatement, Resolver, SignedInteger, SubRoutine
+
+def test_pointer_types_are_shared_per_resolver():
+	first = Resolver([SignedInteger()], [])
+	second = Resolver([SignedInteger()], [])
+	assert first.GetType("Integer*") is first.GetType("Integer*")
+	assert first.GetType("Integer**").GetReferencedType() is first.GetType("Integer*")
+	assert first.GetType("Integer*") is not second.GetType("Integer*")
+	assert first.GetType("Integer*") == second.GetType("Integer*")
+
+def test_frame_sizes_are_available_before_resolve():
+	integer = SignedInteger()
+	sub = SubRoutine("Work", [(integer, "a", False), (integer, "b", False)], [LocalStatement(Local(integer, "x", None))])
+	function = Function("Value", [(integer, "a", False)], integer, [])
+	assert sub.GetArgumentsSize() == 2
+	assert sub.GetLocalsSize() == 1
+	assert sub.GetArgumentOffset(0) == 1
+	assert function.GetArgumentsSize() == 1
+	assert function.GetLocalsSize() == 0
@@ -0,0 +1,185 @@
+import io
+
+import pytest
+
+from compiler import SignedInteger, UnsignedInteger
+from emitter import Comparison
+from emitters.urcl import URCLEmitter
+from parser import parse_module
+
+def compile_source(source: str, **options) -> "list[str]":
+	module = parse_module("Test", source.splitlines())
+	module.Resolve(module.GetResolver([SignedInteger(), UnsignedInteger()], []))
+	emitter = URCLEmitter(**options)
+	module.Emit(emitter)
+	stream = io.StringIO()
+	emitter.commit(stream)
+	return stream.getvalue().splitlines()
+
+def test_call_result_is_not_replaced_by_previous_argument():
+	source = "\n".join([
+		"Sub Foo(a As Integer)",
+		"	a = 1",
+		"End Sub",
+		"Function Bar() As Integer",
+		"	Return 9",
+		"End Function",
+		"Sub Main()",
+		"	Dim q As Integer",
+		"	Foo(5)",
+		"	q = Bar()",
+		"End Sub"
+	])
+	for options in [{}, { "showIL": True }]:
+		lines = [line for line in compile_source(source, **options) if not line.startswith("//")]
+		main = lines[lines.index(".Main"):]
+		store = main[main.index("cal .Bar"):]
+		assert "str R1 5" not in store
+		assert "pop R2" in store and "str R1 R2" in store
+
+def commit_raw(instructions: "list[list[str]]", **options) -> "list[str]":
+	emitter = URCLEmitter(**options)
+	for instruction in instructions: emitter.emit_raw(instruction[0], instruction[1:])
+	stream = io.StringIO()
+	emitter.commit(stream)
+	return stream.getvalue().splitlines()
+
+def test_overwritten_result_is_removed_within_block():
+	lines = commit_raw([["mov", "R1", "R2"], ["add", "R5", "R5", "1"], ["mov", "R1", "R6"], ["psh", "R1"], ["hlt"]])
+	assert lines == ["add R5 R5 1", "mov R1 R6", "psh R1", "hlt"]
+
+def test_result_read_before_overwrite_is_kept():
+	lines = commit_raw([["mov", "R1", "R2"], ["str", "R5", "R1"], ["mov", "R1", "R6"], ["psh", "R1"], ["hlt"]])
+	assert lines[0] == "mov R1 R2"
+
+def test_push_is_not_forwarded_across_branch_target():
+	emitter = URCLEmitter()
+	emitter.ld_global(0)
+	emitter.ld_global(1)
+	emitter.add()
+	target = emitter.get_current_offset()
+	emitter.ld_ptr(0)
+	emitter.st_global(2)
+	emitter.jmp(target)
+	assert ["psh", "R1"] in emitter._insts
+	assert ["pop", "R6"] in emitter._insts
+
+def test_push_is_forwarded_within_instruction_sequence():
+	emitter = URCLEmitter()
+	emitter.ld_global(0)
+	emitter.ld_global(1)
+	emitter.add()
+	emitter.st_global(2)
+	assert ["psh", "R1"] not in emitter._insts
+	assert ["mov", "R6", "R1"] in emitter._insts
+
+def test_result_is_kept_across_unlisted_branch():
+	lines = commit_raw([["mov", "R1", "R2"], ["brp", ".L", "R4", "R5"], ["mov", "R1", "R6"], ["hlt"], [".L"], ["psh", "R1"], ["hlt"]])
+	assert lines[0] == "mov R1 R2"
+
+def test_raw_label_keeps_its_case():
+	emitter = URCLEmitter(optimize=False)
+	emitter.emit_raw(".Loop", [])
+	emitter.emit_raw("JMP", [".Loop"])
+	assert [".Loop"] in emitter._insts
+	assert ["jmp", ".Loop"] in emitter._insts
+
+def test_asm_label_matches_jump_target():
+	source = "\n".join([
+		"Sub Main()",
+		"	Asm Exec .Loop",
+		"	Asm Exec jmp .Loop",
+		"End Sub"
+	])
+	lines = compile_source(source)
+	assert ".Loop" in lines
+	assert "jmp .Loop" in lines
+
+def test_push_is_not_forwarded_into_stack_registers():
+	emitter = URCLEmitter()
+	emitter.ld_bp()
+	emitter.push(1)
+	emitter.sub()
+	emitter.st_sp()
+	emitter.ld_bp()
+	emitter.push(1)
+	emitter.add()
+	emitter.st_bp()
+	assert ["pop", "SP"] in emitter._insts
+	assert ["pop", "R3"] in emitter._insts
+	emitter.ret()
+	emitter.commit(io.StringIO())
+
+def test_jump_to_offset_before_stack_adjustment_has_label():
+	for options in [{ "optimize": False }, {}]:
+		emitter = URCLEmitter(**options)
+		emitter.ld_bp()
+		emitter.ld_sp()
+		emitter.st_bp()
+		top = emitter.get_current_offset()
+		emitter.add_sp(1)
+		emitter.rem_sp(1)
+		emitter.jmp(top)
+		emitter.ld_bp()
+		emitter.st_sp()
+		emitter.st_bp()
+		emitter.ret()
+		stream = io.StringIO()
+		emitter.commit(stream)
+		lines = stream.getvalue().splitlines()
+		assert f"jmp .___urcl___{top}" in lines
+		assert f".___urcl___{top}" in lines
+
+def test_multi_word_load_uses_offset_loads():
+	emitter = URCLEmitter(optimize=False)
+	emitter.ld_ptr(3)
+	assert emitter._insts[1:] == [["pop", "R1"], ["llod", "R2", "R1", "2"], ["psh", "R2"], ["llod", "R2", "R1", "1"], ["psh", "R2"], ["lod", "R2", "R1"], ["psh", "R2"]]
+
+def test_multi_word_store_uses_offset_stores():
+	emitter = URCLEmitter(optimize=False)
+	emitter.st_ptr(3)
+	assert emitter._insts[1:] == [["pop", "R1"], ["pop", "R2"], ["str", "R1", "R2"], ["pop", "R2"], ["lstr", "R1", "1", "R2"], ["pop", "R2"], ["lstr", "R1", "2", "R2"]]
+
+def test_result_read_by_offset_store_is_kept():
+	lines = commit_raw([["mov", "R1", "R2"], ["lstr", "R5", "1", "R1"], ["mov", "R1", "R6"], ["psh", "R1"], ["hlt"]])
+	assert lines[0] == "mov R1 R2"
+	assert "lstr R5 1 R1" in lines
+
+def run_branchless_compare(comparison: Comparison, left: int, right: int) -> int:
+	predicates = {
+		"sete": lambda a, b: a == b,
+		"setne": lambda a, b: a != b,
+		"setl": lambda a, b: a < b,
+		"setg": lambda a, b: a > b,
+		"setle": lambda a, b: a <= b,
+		"setge": lambda a, b: a >= b
+	}
+	emitter = URCLEmitter(optimize=False, branchlessCompare=True)
+	emitter.compare(comparison)
+	stack = [left, right]
+	registers = {}
+	def value(operand): return registers[operand] if operand in registers else int(operand)
+	for inst in emitter._insts:
+		if inst[0].startswith("."): continue
+		elif inst[0] == "pop": registers[inst[1]] = stack.pop()
+		elif inst[0] == "psh": stack.append(value(inst[1]))
+		elif inst[0] == "and": registers[inst[1]] = value(inst[2]) & value(inst[3])
+		else: registers[inst[1]] = 0xFFFF if predicates[inst[0]](value(inst[2]), value(inst[3])) else 0
+	assert len(stack) == 1
+	return stack[0]
+
+def test_branchless_compare_pushes_zero_or_one():
+	expected = {
+		Comparison.EQ: lambda a, b: a == b,
+		Comparison.NE: lambda a, b: a != b,
+		Comparison.LT_U: lambda a, b: a < b,
+		Comparison.GT_U: lambda a, b: a > b,
+		Comparison.LE_U: lambda a, b: a <= b,
+		Comparison.GE_U: lambda a, b: a >= b
+	}
+	for comparison in Comparison:
+		if comparison not in expected:
+			with pytest.raises(NotImplementedError): URCLEmitter(branchlessCompare=True).compare(comparison)
+			continue
+		for left, right in [(1, 2), (2, 2), (3, 2)]:
+			assert run_branchless_compare(comparison, left, right) == (1 if expected[comparison](left, right) else 0)